@@ -1,6 +1,6 @@
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
+from sqlalchemy import create_engine
 from sqlalchemy import pool
 
 from alembic import context
@@ -18,8 +18,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Set the database URL from our settings
-config.set_main_option("sqlalchemy.url", settings.database_url)
+# Migrations always use a dedicated sync (psycopg2) engine, never the app's
+# asyncpg pool. DDL run through pooled asyncpg connections would invalidate
+# their cached prepared statements (InvalidCachedStatementError) mid-request.
+config.set_main_option("sqlalchemy.url", settings.sync_database_url)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -62,9 +64,8 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
+    connectable = create_engine(
+        settings.sync_database_url,
         poolclass=pool.NullPool,
     )
 
@@ -18,6 +18,15 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _create_index_concurrently(index_name: str, table_name: str, columns: list, unique: bool = False) -> None:
+    """Build a secondary index without blocking writes to the table."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            index_name, table_name, columns, unique=unique,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
 def upgrade() -> None:
     """Create all tables from scratch."""
     # Create users table
@@ -32,8 +41,7 @@ def upgrade() -> None:
         sa.Column('is_active', sa.Boolean(), nullable=True),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    _create_index_concurrently(op.f('ix_users_email'), 'users', ['email'], unique=True)
 
     # Create companies table
     op.create_table('companies',
@@ -44,8 +52,7 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
-    op.create_index(op.f('ix_companies_nip'), 'companies', ['nip'], unique=True)
+    _create_index_concurrently(op.f('ix_companies_nip'), 'companies', ['nip'], unique=True)
 
     # Create api_tokens table
     op.create_table('api_tokens',
@@ -62,7 +69,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_api_tokens_id'), 'api_tokens', ['id'], unique=False)
 
     # Create regon_data table
     op.create_table('regon_data',
@@ -76,7 +82,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_regon_data_id'), 'regon_data', ['id'], unique=False)
 
     # Create mf_data table
     op.create_table('mf_data',
@@ -88,7 +93,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_mf_data_id'), 'mf_data', ['id'], unique=False)
 
     # Create vies_data table
     op.create_table('vies_data',
@@ -101,7 +105,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_vies_data_id'), 'vies_data', ['id'], unique=False)
 
     # Create company_bank_accounts table
     op.create_table('company_bank_accounts',
@@ -115,7 +118,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_company_bank_accounts_id'), 'company_bank_accounts', ['id'], unique=False)
 
     # Create iban_enrichment table
     op.create_table('iban_enrichment',
@@ -133,7 +135,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['account_id'], ['company_bank_accounts.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_iban_enrichment_id'), 'iban_enrichment', ['id'], unique=False)
 
     # Create user_company_subscriptions table
     op.create_table('user_company_subscriptions',
@@ -153,11 +154,10 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_user_company_subscriptions_id'), 'user_company_subscriptions', ['id'], unique=False)
 
     # Create callback_queue table
     op.create_table('callback_queue',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
         sa.Column('user_id', sa.Integer(), nullable=False),
         sa.Column('company_nip', sa.String(length=10), nullable=False),
         sa.Column('providers', sa.ARRAY(sa.String()), nullable=False),
@@ -172,12 +172,11 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_callback_queue_id'), 'callback_queue', ['id'], unique=False)
 
     # Create webhook_deliveries table
     op.create_table('webhook_deliveries',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('callback_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('callback_id', sa.BigInteger(), nullable=False),
         sa.Column('attempt_number', sa.Integer(), nullable=False),
         sa.Column('http_status', sa.Integer(), nullable=True),
         sa.Column('response_body', sa.Text(), nullable=True),
@@ -187,11 +186,10 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['callback_id'], ['callback_queue.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_webhook_deliveries_id'), 'webhook_deliveries', ['id'], unique=False)
 
     # Create api_usage table
     op.create_table('api_usage',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
         sa.Column('user_id', sa.Integer(), nullable=False),
         sa.Column('token_id', sa.Integer(), nullable=False),
         sa.Column('company_nip', sa.String(length=10), nullable=True),
@@ -207,11 +205,10 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_api_usage_id'), 'api_usage', ['id'], unique=False)
 
     # Create data_changes table
     op.create_table('data_changes',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False),
         sa.Column('company_id', sa.Integer(), nullable=False),
         sa.Column('provider', sa.String(length=20), nullable=False),
         sa.Column('change_type', sa.String(length=20), nullable=False),
@@ -222,7 +219,6 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_data_changes_id'), 'data_changes', ['id'], unique=False)
 
 
 def downgrade() -> None:
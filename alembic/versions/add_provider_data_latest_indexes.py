@@ -0,0 +1,35 @@
+"""Add (company_id, fetched_at DESC) indexes on provider data tables
+
+Revision ID: provider_data_latest_indexes
+Revises: hot_update_fillfactor
+Create Date: 2025-01-29 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'provider_data_latest_indexes'
+down_revision = 'hot_update_fillfactor'
+branch_labels = None
+depends_on = None
+
+
+# Serve "latest row for company" lookups with an index seek instead of a sort;
+# companies.nip is already covered by the unique ix_companies_nip
+TABLES = ['regon_data', 'mf_data', 'vies_data']
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_company_fetched "
+                f"ON {table} (company_id, fetched_at DESC)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_company_fetched")
@@ -0,0 +1,38 @@
+"""Add indexes for token, callback and subscription lookups
+
+Revision ID: runtime_lookup_indexes
+Revises: drop_pk_id_indexes
+Create Date: 2025-01-28 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'runtime_lookup_indexes'
+down_revision = 'drop_pk_id_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_api_tokens_token_hash "
+            "ON api_tokens (token_hash)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_callback_queue_pending "
+            "ON callback_queue (next_retry_at) WHERE status = 'pending'"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_company_subscriptions_due "
+            "ON user_company_subscriptions (next_validation_at) WHERE is_active IS true"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_company_subscriptions_due")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_callback_queue_pending")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_api_tokens_token_hash")
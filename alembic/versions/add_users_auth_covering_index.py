@@ -0,0 +1,36 @@
+"""Cover login lookups with an INCLUDE index on lower(email)
+
+Revision ID: users_auth_covering_index
+Revises: provider_data_latest_indexes
+Create Date: 2025-01-30 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'users_auth_covering_index'
+down_revision = 'provider_data_latest_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same unique key as ix_users_email_lower, plus the columns the login
+    # lookup reads, so it can be answered by an index-only scan
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_auth_lookup "
+            "ON users (LOWER(email)) "
+            "INCLUDE (id, email, plan, is_active, password_hash, oauth_provider)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower "
+            "ON users (LOWER(email))"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_auth_lookup")
@@ -0,0 +1,32 @@
+"""Add case-insensitive unique index on users.email
+
+Revision ID: users_email_lower
+Revises: oauth_fields
+Create Date: 2025-01-28 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'users_email_lower'
+down_revision = 'oauth_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Emails are normalized to lowercase on write from now on
+    op.execute("UPDATE users SET email = LOWER(email) WHERE email <> LOWER(email)")
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_lower "
+            "ON users (LOWER(email))"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
@@ -0,0 +1,32 @@
+"""Convert company_bank_accounts.source to a Postgres ENUM
+
+Revision ID: bank_account_source_enum
+Revises: users_auth_covering_index
+Create Date: 2025-01-30 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'bank_account_source_enum'
+down_revision = 'users_auth_covering_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New sources can be added later with ALTER TYPE ... ADD VALUE
+    op.execute("CREATE TYPE bank_account_source AS ENUM ('mf', 'manual')")
+    op.execute(
+        "ALTER TABLE company_bank_accounts ALTER COLUMN source "
+        "TYPE bank_account_source USING source::bank_account_source"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE company_bank_accounts ALTER COLUMN source "
+        "TYPE VARCHAR(20) USING source::text"
+    )
+    op.execute("DROP TYPE bank_account_source")
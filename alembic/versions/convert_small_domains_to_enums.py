@@ -0,0 +1,49 @@
+"""Convert small fixed-domain VARCHAR columns to Postgres ENUM types
+
+Revision ID: small_domain_enums
+Revises: runtime_lookup_indexes
+Create Date: 2025-01-29 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'small_domain_enums'
+down_revision = 'runtime_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (table, column, enum type, values, original VARCHAR length)
+ENUM_COLUMNS = [
+    ('users', 'plan', 'user_plan', ('free', 'pro', 'premium', 'enterprise'), 20),
+    ('regon_data', 'entity_type', 'regon_entity_type', ('P', 'F', 'LP', 'LF'), 2),
+    ('user_company_subscriptions', 'validation_schedule', 'validation_schedule',
+     ('daily', 'weekly', 'monthly', 'custom'), 20),
+    ('callback_queue', 'trigger_type', 'callback_trigger_type',
+     ('scheduled', 'opportunistic', 'on_demand'), 20),
+    ('callback_queue', 'status', 'callback_status',
+     ('pending', 'processing', 'completed', 'failed'), 20),
+    ('data_changes', 'provider', 'data_provider', ('regon', 'mf', 'vies', 'iban'), 20),
+    ('data_changes', 'change_type', 'data_change_type', ('created', 'updated', 'deleted'), 20),
+]
+
+
+def upgrade() -> None:
+    for table, column, type_name, values, _ in ENUM_COLUMNS:
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({labels})")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE {type_name} USING {column}::{type_name}"
+        )
+
+
+def downgrade() -> None:
+    for table, column, type_name, _, length in reversed(ENUM_COLUMNS):
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE VARCHAR({length}) USING {column}::text"
+        )
+        op.execute(f"DROP TYPE {type_name}")
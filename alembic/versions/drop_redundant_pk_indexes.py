@@ -0,0 +1,45 @@
+"""Drop redundant ix_*_id indexes on primary key columns
+
+Revision ID: drop_pk_id_indexes
+Revises: users_email_lower
+Create Date: 2025-01-28 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'drop_pk_id_indexes'
+down_revision = 'users_email_lower'
+branch_labels = None
+depends_on = None
+
+
+# The primary key already provides a unique btree on each of these columns
+TABLES = [
+    'users',
+    'companies',
+    'api_tokens',
+    'regon_data',
+    'mf_data',
+    'vies_data',
+    'company_bank_accounts',
+    'iban_enrichment',
+    'user_company_subscriptions',
+    'callback_queue',
+    'webhook_deliveries',
+    'api_usage',
+    'data_changes',
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_id ON {table} (id)")
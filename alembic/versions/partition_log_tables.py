@@ -0,0 +1,135 @@
+"""Partition api_usage and webhook_deliveries by month
+
+Revision ID: partition_log_tables
+Revises: bigint_log_ids
+Create Date: 2025-01-29 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_log_tables'
+down_revision = 'bigint_log_ids'
+branch_labels = None
+depends_on = None
+
+
+# Months of partitions created ahead of time; the app keeps it topped up
+# (see app/db/partitions.py)
+MONTHS_AHEAD = 3
+
+CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent text, months_ahead int)
+RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', now())::date;
+    partition_name text;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        partition_name := format('%s_%s', parent, to_char(month_start, 'YYYY_MM'));
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent, month_start, (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _api_usage_columns() -> list:
+    return [
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('api_usage_id_seq')"), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_id', sa.Integer(), nullable=False),
+        sa.Column('company_nip', sa.String(length=10), nullable=True),
+        sa.Column('endpoint', sa.String(length=100), nullable=False),
+        sa.Column('providers_requested', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('providers_fresh', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('providers_cached', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('providers_rate_limited', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('response_status', sa.Integer(), nullable=False),
+        sa.Column('response_time_ms', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['token_id'], ['api_tokens.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _webhook_deliveries_columns() -> list:
+    return [
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('webhook_deliveries_id_seq')"), nullable=False),
+        sa.Column('callback_id', sa.BigInteger(), nullable=False),
+        sa.Column('attempt_number', sa.Integer(), nullable=False),
+        sa.Column('http_status', sa.Integer(), nullable=True),
+        sa.Column('response_body', sa.Text(), nullable=True),
+        sa.Column('response_headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('success', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['callback_id'], ['callback_queue.id'], ondelete='CASCADE'),
+    ]
+
+
+# table -> (column builder, partition key, secondary index name, index columns)
+TABLES = {
+    'api_usage': (
+        _api_usage_columns, 'created_at',
+        'ix_api_usage_user_id_created_at', 'user_id, created_at DESC',
+    ),
+    'webhook_deliveries': (
+        _webhook_deliveries_columns, 'delivered_at',
+        'ix_webhook_deliveries_callback_id_delivered_at', 'callback_id, delivered_at DESC',
+    ),
+}
+
+
+def _swap_table(table: str, build_new) -> None:
+    """Replace a table with a new definition, keeping its rows and ID sequence."""
+    old_table = f"{table}_old"
+    op.rename_table(table, old_table)
+    op.execute(f"ALTER TABLE {old_table} RENAME CONSTRAINT {table}_pkey TO {old_table}_pkey")
+    # Keep the sequence alive when the old table is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    build_new()
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old_table}")
+    op.drop_table(old_table)
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def upgrade() -> None:
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    for table, (columns, partition_key, index_name, index_columns) in TABLES.items():
+        # The partition key becomes part of the primary key
+        op.execute(f"UPDATE {table} SET {partition_key} = now() WHERE {partition_key} IS NULL")
+
+        def build_partitioned():
+            op.create_table(
+                table,
+                *columns(),
+                sa.PrimaryKeyConstraint('id', partition_key),
+                postgresql_partition_by=f'RANGE ({partition_key})',
+            )
+            op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+            op.execute(f"SELECT create_monthly_partitions('{table}', {MONTHS_AHEAD})")
+            op.execute(f"CREATE INDEX {index_name} ON {table} ({index_columns})")
+
+        _swap_table(table, build_partitioned)
+
+
+def downgrade() -> None:
+    for table, (columns, *_) in TABLES.items():
+        def build_plain():
+            op.create_table(
+                table,
+                *columns(),
+                sa.PrimaryKeyConstraint('id'),
+            )
+
+        _swap_table(table, build_plain)
+
+    op.execute("DROP FUNCTION IF EXISTS create_monthly_partitions(text, int)")
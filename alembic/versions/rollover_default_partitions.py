@@ -0,0 +1,106 @@
+"""Let create_monthly_partitions move rows out of a non-empty default partition
+
+Revision ID: rollover_default_partitions
+Revises: bank_account_source_enum
+Create Date: 2025-01-31 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'rollover_default_partitions'
+down_revision = 'bank_account_source_enum'
+branch_labels = None
+depends_on = None
+
+
+# A month that already has rows in the default partition cannot simply be
+# created: the default is detached, the month's rows are moved into the new
+# partition and the default is re-attached, all in the caller's transaction.
+# The advisory lock keeps concurrent callers (one per app worker) from racing.
+CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent text, months_ahead int)
+RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', now())::date;
+    month_end date;
+    partition_name text;
+    default_name text;
+    partition_key text;
+    has_rows boolean;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('create_monthly_partitions:' || parent));
+
+    SELECT c.relname INTO default_name
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = parent::regclass
+      AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+    partition_key := substring(pg_get_partkeydef(parent::regclass) FROM '\\((.*)\\)');
+
+    FOR i IN 0..months_ahead LOOP
+        partition_name := format('%s_%s', parent, to_char(month_start, 'YYYY_MM'));
+        month_end := (month_start + interval '1 month')::date;
+
+        IF to_regclass(partition_name) IS NULL THEN
+            has_rows := false;
+            IF default_name IS NOT NULL THEN
+                EXECUTE format(
+                    'SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                    default_name, partition_key, month_start, partition_key, month_end
+                ) INTO has_rows;
+            END IF;
+
+            IF has_rows THEN
+                EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, default_name);
+            END IF;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, month_end
+            );
+            IF has_rows THEN
+                EXECUTE format(
+                    'INSERT INTO %I SELECT * FROM %I WHERE %I >= %L AND %I < %L',
+                    partition_name, default_name, partition_key, month_start, partition_key, month_end
+                );
+                EXECUTE format(
+                    'DELETE FROM %I WHERE %I >= %L AND %I < %L',
+                    default_name, partition_key, month_start, partition_key, month_end
+                );
+                EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent, default_name);
+            END IF;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Definition from partition_log_tables
+PREVIOUS_CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent text, months_ahead int)
+RETURNS void AS $$
+DECLARE
+    month_start date := date_trunc('month', now())::date;
+    partition_name text;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        partition_name := format('%s_%s', parent, to_char(month_start, 'YYYY_MM'));
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent, month_start, (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_CREATE_MONTHLY_PARTITIONS)
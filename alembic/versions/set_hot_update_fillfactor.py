@@ -0,0 +1,30 @@
+"""Lower fillfactor on frequently updated tables
+
+Revision ID: hot_update_fillfactor
+Revises: partition_log_tables
+Create Date: 2025-01-29 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'hot_update_fillfactor'
+down_revision = 'partition_log_tables'
+branch_labels = None
+depends_on = None
+
+
+# Rows here are updated in place on every poll/delivery/token use; free space
+# in each page lets Postgres apply those updates as HOT updates
+TABLES = ['user_company_subscriptions', 'callback_queue', 'api_tokens']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = 90)")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} RESET (fillfactor)")
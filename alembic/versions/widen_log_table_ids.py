@@ -0,0 +1,33 @@
+"""Widen append-only log table IDs to BIGINT
+
+Revision ID: bigint_log_ids
+Revises: small_domain_enums
+Create Date: 2025-01-29 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'bigint_log_ids'
+down_revision = 'small_domain_enums'
+branch_labels = None
+depends_on = None
+
+
+# Tables whose serial IDs may outgrow INT4; already BIGINT on fresh installs
+TABLES = ['callback_queue', 'webhook_deliveries', 'api_usage', 'data_changes']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id TYPE BIGINT")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS BIGINT")
+    op.execute("ALTER TABLE webhook_deliveries ALTER COLUMN callback_id TYPE BIGINT")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE webhook_deliveries ALTER COLUMN callback_id TYPE INTEGER")
+    for table in reversed(TABLES):
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS INTEGER")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id TYPE INTEGER")
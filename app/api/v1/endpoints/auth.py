@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.auth import (
     LoginRequest,
@@ -16,20 +16,25 @@ from app.schemas.auth import (
     OAuthAuthUrlRequest,
     OAuthAuthUrlResponse,
 )
-from app.deps import get_db, get_current_active_user
-from app.crud.users import authenticate_user, create_user, get_user_by_email, create_oauth_user, get_oauth_user
+from app.deps import get_db, get_current_user_profile
+from app.crud.users import authenticate_user, create_user, create_oauth_user, update_oauth_user
 from app.utils.security import create_access_token
 from app.security.oauth import oauth_service
 from app.middleware.recaptcha import verify_recaptcha_token
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+def _user_to_response(user) -> UserResponse:
+    """Build a UserResponse from a User ORM object."""
+    return UserResponse.model_validate(user)
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
     http_request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Authenticate user
@@ -49,7 +54,8 @@ async def login(
         )
 
     # Authenticate user
-    user = authenticate_user(db, request.email, request.password)
+    email = request.email.strip().lower()
+    user = await authenticate_user(db, email, request.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,18 +66,7 @@ async def login(
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id)})
 
-    user_response = UserResponse(
-        id=user.id, # type: ignore
-        email=user.email, # type: ignore
-        name=user.name, # type: ignore
-        plan=user.plan, # type: ignore
-        created_at=user.created_at, # type: ignore
-        is_active=user.is_active, # type: ignore
-        oauth_provider=user.oauth_provider, # type: ignore
-        github_username=user.github_username, # type: ignore
-        google_email=user.google_email, # type: ignore
-        avatar_url=user.avatar_url # type: ignore
-    )
+    user_response = _user_to_response(user)
 
     return LoginResponse(
         data=LoginResponseData(token=access_token, user=user_response),
@@ -83,7 +78,7 @@ async def login(
 async def register(
     request: RegisterRequest,
     http_request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register new user
@@ -103,18 +98,10 @@ async def register(
             action="register"
         )
 
-    # Check if user already exists
-    existing_user = get_user_by_email(db, request.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    # Create new user
-    try:
-        user = create_user(db, request.email, request.password, request.name, plan="free")
-    except IntegrityError:
+    # Create new user (None means the email is already taken)
+    email = request.email.strip().lower()
+    user = await create_user(db, email, request.password, request.name, plan="free")
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -123,18 +110,7 @@ async def register(
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id)})
 
-    user_response = UserResponse(
-        id=user.id, # type: ignore
-        email=user.email, # type: ignore
-        name=user.name, # type: ignore
-        plan=user.plan, # type: ignore
-        created_at=user.created_at, # type: ignore
-        is_active=user.is_active, # type: ignore
-        oauth_provider=user.oauth_provider, # type: ignore
-        github_username=user.github_username, # type: ignore
-        google_email=user.google_email, # type: ignore
-        avatar_url=user.avatar_url # type: ignore
-    )
+    user_response = _user_to_response(user)
 
     return RegisterResponse(
         data=RegisterResponseData(token=access_token, user=user_response),
@@ -143,23 +119,10 @@ async def register(
 
 
 @router.get("/me", response_model=UserProfileResponse)
-async def get_current_user_info(current_user=Depends(get_current_active_user)):
+async def get_current_user_info(current_user: UserResponse = Depends(get_current_user_profile)):
     """Get current user information."""
-    user_data = UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        name=current_user.name,
-        plan=current_user.plan,
-        created_at=current_user.created_at,
-        is_active=current_user.is_active,
-        oauth_provider=current_user.oauth_provider,
-        github_username=current_user.github_username,
-        google_email=current_user.google_email,
-        avatar_url=current_user.avatar_url
-    )
-
     return UserProfileResponse(
-        data=user_data,
+        data=current_user,
         success=True
     )
 
@@ -191,7 +154,7 @@ async def oauth_callback(
     provider: str,
     request: OAuthCallbackRequest,
     http_request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Handle OAuth callback
@@ -211,26 +174,16 @@ async def oauth_callback(
                 action="oauth_callback"
             )
 
-        # Complete OAuth flow and get user info
-        oauth_user_info, token_response = await oauth_service.complete_oauth_flow(provider, request.code)
-
-        # Check if user already exists by provider ID
-        existing_user = get_oauth_user(db, provider, oauth_user_info.provider_id)
-
-        if existing_user:
-            # Update existing user's OAuth info
-            user = existing_user
-            if provider == "github":
-                user.github_username = oauth_user_info.username
-            elif provider == "google":
-                user.google_email = oauth_user_info.email
-            user.avatar_url = oauth_user_info.avatar_url
-            db.commit()
-            db.refresh(user)
-        else:
+        # Exchange the code once and reuse the token for both branches below
+        token_response = await oauth_service.exchange_code_for_token(provider, request.code)
+        oauth_user_info = await oauth_service.fetch_user_info(provider, token_response.access_token)
+
+        # Refresh the OAuth fields of an already linked user in one UPDATE ... RETURNING
+        user = await update_oauth_user(db, oauth_user_info)
+
+        if user is None:
             # Create new user or link OAuth to existing email
-            # token_response is already obtained from complete_oauth_flow
-            user = create_oauth_user(
+            user = await create_oauth_user(
                 db,
                 oauth_user_info,
                 token_response.access_token,
@@ -240,18 +193,7 @@ async def oauth_callback(
         # Create JWT token
         access_token = create_access_token(data={"sub": str(user.id)})
 
-        user_response = UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            plan=user.plan,
-            created_at=user.created_at,
-            is_active=user.is_active,
-            oauth_provider=user.oauth_provider,
-            github_username=user.github_username,
-            google_email=user.google_email,
-            avatar_url=user.avatar_url
-        )
+        user_response = _user_to_response(user)
 
         return OAuthCallbackResponse(
             data=LoginResponseData(token=access_token, user=user_response),
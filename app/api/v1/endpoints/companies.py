@@ -1,44 +1,180 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from app.schemas.company import (
-    ErrorResponse,
-    CompanyDataResponse,
-    CompanyMetadataResponse,
-    CompanyResponse,
-    ProviderMetadata,
-)
+import asyncio
+import hashlib
+import math
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.base import ApiResponse
-from app.providers.regon import RegonProvider
-from app.providers.mf import MfProvider
-from app.providers.base import RateLimitError, ValidationError, ProviderError
+from app.providers.regon import regon_provider
+from app.providers.mf import mf_provider
+from app.providers.base import BaseProvider, RateLimitError, ProviderError
 from app.utils.validators import normalize_nip
-from app.db.database import get_db
-from app.db.models import Company, RegonData, MfData
+from app.deps import get_db
 from app.crud.companies import (
+    ProviderRow,
+    create_company,
+    get_company_data_cached,
     get_or_create_company,
-    get_regon_data,
     is_regon_data_expired,
     store_regon_data,
-    get_mf_data,
     is_mf_data_expired,
     store_mf_data,
+    invalidate_provider_cache,
 )
 
 router = APIRouter()
 
+# Upstream fetches currently in flight, keyed by (provider name, nip, refresh)
+_inflight: Dict[Tuple[str, str, bool], "asyncio.Task[Dict[str, Any]]"] = {}
+
+
+# Providers that can be named in the refresh parameter
+PROVIDER_NAMES: FrozenSet[str] = frozenset({"regon", "mf", "vies"})
+
+
+def _parse_refresh(
+    refresh: Optional[str] = Query(
+        None, description="Comma-separated list of providers to refresh (regon,mf,vies), or 'all'"
+    ),
+) -> FrozenSet[str]:
+    """Parse and validate the providers requested for refresh."""
+    if not refresh:
+        return frozenset()
+    if refresh in ("true", "all"):
+        return PROVIDER_NAMES
+    providers = frozenset(p.strip() for p in refresh.split(","))
+    unknown = providers - PROVIDER_NAMES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown providers: {', '.join(sorted(unknown))}")
+    return providers
+
+
+def _provider_metadata(
+    status: str,
+    fetched_at: Optional[str] = None,
+    next_available_at: Optional[datetime] = None,
+    error_message: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a JSON-ready dict in the shape of the ProviderMetadata schema."""
+    return {
+        "status": status,
+        "cached_at": None,
+        "fetched_at": fetched_at,
+        "next_available_at": next_available_at.isoformat() if next_available_at else None,
+        "error_message": error_message,
+    }
+
+
+def _forget_inflight(key: Tuple[str, str, bool], task: "asyncio.Task[Dict[str, Any]]") -> None:
+    """Drop a finished fetch from the in-flight table."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the exception retrieved in case every waiting request has gone away
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_coalesced(provider: BaseProvider, nip: str, refresh: bool = False) -> Dict[str, Any]:
+    """Fetch from a provider, sharing one upstream call between concurrent requests for the same NIP.
+
+    The fetch runs in its own task, so a disconnecting client only stops
+    waiting; the other requests sharing it still get the result.
+    """
+    key = (provider.name, nip, refresh)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(provider.fetch_data(nip, refresh=refresh))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _forget_inflight(key, t))
+    return await asyncio.shield(task)
+
+
+def _metadata_for_error(
+    exc: ProviderError, cached: Optional[ProviderRow]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]:
+    """Map a provider error to (metadata, data, rate_limited), falling back to cached data when throttled."""
+    if isinstance(exc, RateLimitError):
+        metadata = _provider_metadata("rate_limited", next_available_at=exc.retry_after)
+        if cached:
+            metadata["status"] = "cached_due_to_rate_limit"
+            return metadata, cached.data, True  # type: ignore
+        return metadata, None, True
+    return _provider_metadata("error", error_message=exc.message), None, False
+
+
+async def _handle_provider(
+    provider: BaseProvider,
+    nip: str,
+    cached: Optional[ProviderRow],
+    force_refresh: bool,
+    is_expired: Callable[[Optional[ProviderRow]], bool],
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]:
+    """Resolve a provider's data from cache or upstream.
+
+    Returns (metadata, data, rate_limited).
+    """
+    if not force_refresh and cached and not is_expired(cached):
+        return (
+            _provider_metadata("cached", fetched_at=cached.fetched_at.isoformat()),
+            cached.data,  # type: ignore
+            False,
+        )
+
+    try:
+        data = await _fetch_coalesced(provider, nip, refresh=force_refresh)
+    except ProviderError as e:
+        return _metadata_for_error(e, cached)
+    return _provider_metadata("fresh", fetched_at=data.get("fetched_at")), data, False
+
+
+def _retry_after_header(*metadata: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Retry-After header for the earliest time a rate-limited provider becomes available again."""
+    retry_at = [
+        datetime.fromisoformat(m["next_available_at"]).astimezone(timezone.utc)
+        for m in metadata
+        if m["next_available_at"]
+    ]
+    if not retry_at:
+        return None
+    seconds = (min(retry_at) - datetime.now(timezone.utc)).total_seconds()
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+def _cacheable_response(
+    request: Request, content: Dict[str, Any], expires_at: List[Optional[datetime]]
+) -> Response:
+    """Serialize content with ETag/Cache-Control headers, or return 304 if the client's copy matches.
+
+    The response is only cacheable until the earliest provider expiry, and
+    not at all when any provider has no stored row behind it.
+    """
+    body = orjson.dumps(content)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if None in expires_at:
+        cache_control = "no-cache"
+    else:
+        ttl = min(expires_at) - datetime.now(timezone.utc)  # type: ignore
+        cache_control = f"public, max-age={max(0, int(ttl.total_seconds()))}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/{nip}", response_model=ApiResponse)
 async def get_company_data(
+    request: Request,
     nip: str,
-    refresh: Optional[str] = Query(
-        None, description="Comma-separated list of providers to refresh (regon,mf,vies)"
-    ),
+    refresh_providers: FrozenSet[str] = Depends(_parse_refresh),
     partial: Optional[str] = Query(
         None,
         description="Set to 'allow' to return 200 with partial data instead of 429",
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get company data by NIP.
@@ -53,139 +189,120 @@ async def get_company_data(
     if not normalized_nip:
         raise HTTPException(status_code=400, detail="Invalid NIP format")
 
-    # Parse refresh parameter
-    refresh_providers = []
-    if refresh:
-        if refresh == 'true':
-            refresh_providers = ['regon', 'mf']
+    # Latest provider rows; the company row is only resolved below if fresh data has to be stored
+    company, cached_regon_data, cached_mf_data = await get_company_data_cached(db, normalized_nip)
+
+    # Fetch from providers concurrently
+    results = await asyncio.gather(
+        _handle_provider(
+            regon_provider,
+            normalized_nip,
+            cached_regon_data,
+            "regon" in refresh_providers,
+            is_regon_data_expired,
+        ),
+        _handle_provider(
+            mf_provider,
+            normalized_nip,
+            cached_mf_data,
+            "mf" in refresh_providers,
+            is_mf_data_expired,
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    (regon_metadata, regon_data, regon_rate_limited), (mf_metadata, mf_data, mf_rate_limited) = results  # type: ignore
+
+    any_rate_limited = regon_rate_limited or mf_rate_limited
+
+    # Store fresh data in a single transaction
+    store_regon = (
+        regon_metadata["status"] == "fresh"
+        and "entity_type" in regon_data  # type: ignore
+        and "report_type" in regon_data  # type: ignore
+    )
+    store_mf = mf_metadata["status"] == "fresh"
+    if (store_regon or store_mf) and company is None:
+        if cached_regon_data is None:
+            # The database was already read above and has no company for this NIP
+            company = await create_company(db, normalized_nip, commit=False)
         else:
-            refresh_providers = [p.strip() for p in refresh.split(",")]
+            # Both rows came from Redis, so the company row was never loaded
+            company = await get_or_create_company(db, normalized_nip, commit=False)
 
-    # Get or create company record
-    company: Company = get_or_create_company(db, normalized_nip)
+    regon_row = cached_regon_data if regon_metadata["status"] == "cached" else None
+    if store_regon:
+        regon_row = await store_regon_data(
+            db,
+            company.id,  # type: ignore
+            regon_data["entity_type"],  # type: ignore
+            regon_data["report_type"],  # type: ignore
+            regon_data,  # type: ignore
+            commit=False,
+        )
 
-    # Initialize response data
-    response_data = CompanyDataResponse(nip=normalized_nip)
-    response_metadata = CompanyMetadataResponse()
+        # Update company name if available
+        if "name" in regon_data and regon_data["name"] != company.name:  # type: ignore
+            company.name = regon_data["name"]  # type: ignore
 
-    # Track if any provider is rate limited
-    any_rate_limited = False
+    mf_row = cached_mf_data if mf_metadata["status"] == "cached" else None
+    if store_mf:
+        mf_row = await store_mf_data(db, company.id, mf_data, commit=False)  # type: ignore
 
-    # Handle REGON data
-    should_fetch_regon = "regon" in refresh_providers if refresh else False
-    cached_regon_data: RegonData | None = get_regon_data(db, company.id)  # type: ignore
+        # Update company name if available and not already set
+        if "name" in mf_data and mf_data["name"] and not company.name:  # type: ignore
+            company.name = mf_data["name"]  # type: ignore
 
-    if not should_fetch_regon and cached_regon_data and not is_regon_data_expired(cached_regon_data):
-        # Use cached data
-        response_data.regon = cached_regon_data.data  # type: ignore
-        response_metadata.regon = ProviderMetadata(
-            status="cached", fetched_at=cached_regon_data.fetched_at.isoformat()
-        )
-    else:
-        # Fetch fresh data
-        regon_provider = RegonProvider()
-        try:
-            regon_data = await regon_provider.fetch_data(normalized_nip)
-            response_data.regon = regon_data
-            response_metadata.regon = ProviderMetadata(
-                status="fresh", fetched_at=regon_data.get("fetched_at")
-            )
-
-            # Store in database
-            if "entity_type" in regon_data and "report_type" in regon_data:
-                store_regon_data(
-                    db,
-                    company.id,  # type: ignore
-                    regon_data["entity_type"],
-                    regon_data["report_type"],
-                    regon_data
-                )
-
-                # Update company name if available
-                if "name" in regon_data and regon_data["name"] != company.name:
-                    company.name = regon_data["name"]  # type: ignore
-                    db.commit()
-
-        except RateLimitError as e:
-            any_rate_limited = True
-            response_metadata.regon = ProviderMetadata(
-                status="rate_limited", next_available_at=e.retry_after
-            )
-            # Use cached data if available
-            if cached_regon_data:
-                response_data.regon = cached_regon_data.data  # type: ignore
-                response_metadata.regon.status = "cached_due_to_rate_limit"  # type: ignore
-        except ValidationError as e:
-            response_metadata.regon = ProviderMetadata(
-                status="error", error_message=e.message
-            )
-        except ProviderError as e:
-            response_metadata.regon = ProviderMetadata(
-                status="error", error_message=e.message
-            )
-
-    # Handle MF (Biała Lista) data
-    should_fetch_mf = "mf" in refresh_providers if refresh else False
-    cached_mf_data: MfData | None = get_mf_data(db, company.id)  # type: ignore
-
-    if not should_fetch_mf and cached_mf_data and not is_mf_data_expired(cached_mf_data):
-        # Use cached data
-        response_data.mf = cached_mf_data.data  # type: ignore
-        response_metadata.mf = ProviderMetadata(
-            status="cached", fetched_at=cached_mf_data.fetched_at.isoformat()
-        )
-    else:
-        # Fetch fresh data
-        mf_provider = MfProvider()
-        try:
-            mf_data = await mf_provider.fetch_data(normalized_nip)
-            response_data.mf = mf_data
-            response_metadata.mf = ProviderMetadata(
-                status="fresh", fetched_at=mf_data.get("fetched_at")
-            )
-
-            # Store in database
-            store_mf_data(db, company.id, mf_data)  # type: ignore
-
-            # Update company name if available and not already set
-            if "name" in mf_data and mf_data["name"] and not company.name:  # type: ignore
-                company.name = mf_data["name"]  # type: ignore
-                db.commit()
-
-        except RateLimitError as e:
-            any_rate_limited = True
-            response_metadata.mf = ProviderMetadata(
-                status="rate_limited", next_available_at=e.retry_after
-            )
-            # Use cached data if available
-            if cached_mf_data:
-                response_data.mf = cached_mf_data.data  # type: ignore
-                response_metadata.mf.status = "cached_due_to_rate_limit"  # type: ignore
-        except ValidationError as e:
-            response_metadata.mf = ProviderMetadata(
-                status="error", error_message=e.message
-            )
-        except ProviderError as e:
-            response_metadata.mf = ProviderMetadata(
-                status="error", error_message=e.message
-            )
+    if store_regon or store_mf:
+        await db.commit()
+
+    # Invalidate only after commit so readers cannot re-cache the old rows
+    if store_regon:
+        await invalidate_provider_cache(normalized_nip, "regon")
+    if store_mf:
+        await invalidate_provider_cache(normalized_nip, "mf")
 
     # TODO: Add VIES provider similarly
 
+    # Build the payload as plain dicts; provider data is already JSON-ready,
+    # so re-validating it through the response models is wasted work
+    response_data = {
+        "nip": normalized_nip,
+        "regon": regon_data,
+        "mf": mf_data,
+        "vies": None,
+        "bank_accounts": None,
+    }
+    response_metadata = {
+        "regon": regon_metadata,
+        "mf": mf_metadata,
+        "vies": None,
+    }
+
     # Determine response status
     if any_rate_limited and partial != "allow":
-        # Return 429 with available data
-        error_response = ErrorResponse(
-            error="rate_limited",
-            message="Some providers hit rate limits",
-            data=response_data,
-            metadata=response_metadata,
+        # Return 429 with available data; raising keeps the CORS exception handler in the path
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": "rate_limited",
+                "message": "Some providers hit rate limits",
+                "data": response_data,
+                "metadata": response_metadata,
+            },
+            headers=_retry_after_header(regon_metadata, mf_metadata),
         )
-        raise HTTPException(status_code=429, detail=error_response.model_dump())
 
-    # Return success response wrapped in ApiResponse
-    company_response = CompanyResponse(data=response_data, metadata=response_metadata)
-    return ApiResponse(data=company_response, success=True)
+    # Return success response in the ApiResponse envelope
+    content = {
+        "data": {"data": response_data, "metadata": response_metadata},
+        "message": None,
+        "success": True,
+    }
+    expires_at = [regon_row.expires_at if regon_row else None, mf_row.expires_at if mf_row else None]
+    return _cacheable_response(request, content, expires_at)
 
 
 @router.get("/", response_model=List[str])
@@ -1,4 +1,5 @@
-from fastapi import APIRouter
+import hashlib
+from fastapi import APIRouter, Request, Response
 from pydantic import BaseModel
 from typing import List
 
@@ -23,45 +24,57 @@ class AppConfig(BaseModel):
     features: dict
 
 
+# The config is static, so it is serialized once at import time
+_CONFIG = AppConfig(
+    app_name="CompanyHub",
+    app_version="1.0.0",
+    providers=[
+        ProviderConfig(
+            name="regon",
+            enabled=True,
+            display_name="REGON",
+            description="Oficjalne dane z rejestru działalności gospodarczej",
+            icon="Building"
+        ),
+        ProviderConfig(
+            name="mf",
+            enabled=True,
+            display_name="MF (Biała Lista)",
+            description="Informacje o podatniku VAT z białej listy",
+            icon="ShieldCheck"
+        ),
+        ProviderConfig(
+            name="vies",
+            enabled=False,
+            display_name="VIES",
+            description="Walidacja VAT w systemie VIES UE",
+            icon="Globe"
+        )
+    ],
+    rate_limits={
+        "regon": "1 request per 5 seconds",
+        "mf": "1 request per second",
+        "vies": "1 request per second"
+    },
+    features={
+        "company_search": True,
+        "data_refresh": True,
+        "export_data": False,
+        "webhooks": False,
+        "api_keys": False
+    }
+)
+_CONFIG_JSON = _CONFIG.model_dump_json().encode()
+_CONFIG_ETAG = f'"{hashlib.md5(_CONFIG_JSON, usedforsecurity=False).hexdigest()}"'
+
+
 @router.get("/", response_model=AppConfig)
-async def get_config():
+async def get_config(request: Request):
     """Get application configuration."""
-    return AppConfig(
-        app_name="CompanyHub",
-        app_version="1.0.0",
-        providers=[
-            ProviderConfig(
-                name="regon",
-                enabled=True,
-                display_name="REGON",
-                description="Oficjalne dane z rejestru działalności gospodarczej",
-                icon="Building"
-            ),
-            ProviderConfig(
-                name="mf",
-                enabled=True,
-                display_name="MF (Biała Lista)",
-                description="Informacje o podatniku VAT z białej listy",
-                icon="ShieldCheck"
-            ),
-            ProviderConfig(
-                name="vies",
-                enabled=False,
-                display_name="VIES",
-                description="Walidacja VAT w systemie VIES UE",
-                icon="Globe"
-            )
-        ],
-        rate_limits={
-            "regon": "1 request per 5 seconds",
-            "mf": "1 request per second",
-            "vies": "1 request per second"
-        },
-        features={
-            "company_search": True,
-            "data_refresh": True,
-            "export_data": False,
-            "webhooks": False,
-            "api_keys": False
-        }
-    )
\ No newline at end of file
+    if request.headers.get("if-none-match") == _CONFIG_ETAG:
+        return Response(status_code=304, headers={"ETag": _CONFIG_ETAG})
+    return Response(
+        content=_CONFIG_JSON,
+        media_type="application/json",
+        headers={"ETag": _CONFIG_ETAG},
+    )
@@ -0,0 +1,76 @@
+"""Two-tier cache of the user fields needed for authentication."""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import orjson
+from redis.exceptions import RedisError
+
+from app.cache.redis import get_redis
+from app.config import settings
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in-process for when Redis is unreachable
+_LOCAL_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """Projection of a user row used to authenticate requests.
+
+    Credentials are deliberately left out: the cache is shared and stored as plain JSON.
+    """
+
+    id: int
+    email: str
+    plan: str
+    is_active: bool
+    oauth_provider: Optional[str]
+
+
+_local: "TTLCache[str, CachedUser]" = TTLCache(_LOCAL_MAX_ENTRIES, settings.cache_ttl_auth)
+
+
+def user_cache_key(user_id: int) -> str:
+    """Redis key for a cached /me user profile."""
+    return f"u:{user_id}"
+
+
+def _id_key(user_id: int) -> str:
+    # Versioned so entries written with the old, credential-bearing layout are never read back
+    return f"auth:user:v2:{user_id}"
+
+
+async def get_cached_user_by_id(user_id: int) -> Optional[CachedUser]:
+    """Get a cached user by ID, using the in-process copy only if Redis is unreachable."""
+    key = _id_key(user_id)
+    try:
+        raw = await get_redis().get(key)
+    except RedisError as e:
+        logger.warning("Redis GET %s failed, using local auth cache: %s", key, e)
+        return _local.get(key)
+    return CachedUser(**orjson.loads(raw)) if raw else None
+
+
+async def set_cached_user(user: CachedUser) -> None:
+    """Cache a user under its ID."""
+    key = _id_key(user.id)
+    _local.set(key, user)
+    try:
+        await get_redis().set(key, orjson.dumps(asdict(user)), ex=settings.cache_ttl_auth)
+    except RedisError as e:
+        logger.warning("Redis SET %s failed: %s", key, e)
+
+
+async def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user's cached auth entry and cached profile."""
+    key = _id_key(user_id)
+    _local.pop(key)
+    keys = (key, user_cache_key(user_id))
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning("Redis DEL %s failed: %s", keys, e)
@@ -0,0 +1,32 @@
+"""Redis memoization for upstream API responses."""
+
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+
+from app.cache.redis import cache_get, cache_set
+
+
+async def cached(
+    key: str,
+    ttl: int,
+    producer: Callable[[], Awaitable[Any]],
+    *,
+    should_cache: Optional[Callable[[Any], bool]] = None,
+    refresh: bool = False,
+) -> Any:
+    """Return the JSON value cached under key, or await producer() and cache its result.
+
+    Exceptions from the producer propagate and nothing is cached. Results
+    rejected by should_cache are returned without being stored. With
+    refresh=True the cached value is ignored but the fresh result is stored.
+    """
+    if not refresh:
+        raw = await cache_get(key)
+        if raw is not None:
+            return orjson.loads(raw)
+
+    value = await producer()
+    if should_cache is None or should_cache(value):
+        await cache_set(key, orjson.dumps(value), ttl)
+    return value
@@ -0,0 +1,67 @@
+"""Shared Redis client and fail-open cache helpers."""
+
+import logging
+from typing import List, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    """Get the shared Redis client, creating it on first use."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    """Get a cached value, treating Redis errors as a miss."""
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning("Redis GET %s failed: %s", key, e)
+        return None
+
+
+async def cache_get_many(*keys: str) -> List[Optional[bytes]]:
+    """Get several cached values in one round trip, treating Redis errors as misses."""
+    try:
+        return await get_redis().mget(keys)
+    except RedisError as e:
+        logger.warning("Redis MGET %s failed: %s", keys, e)
+        return [None] * len(keys)
+
+
+async def cache_set(key: str, value: str | bytes, ttl: int) -> None:
+    """Cache a value with a TTL in seconds, ignoring Redis errors."""
+    try:
+        await get_redis().set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning("Redis SET %s failed: %s", key, e)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete cached values, ignoring Redis errors."""
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning("Redis DEL %s failed: %s", keys, e)
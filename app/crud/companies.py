@@ -1,46 +1,85 @@
 """CRUD operations for companies."""
 
-from typing import Optional
+from typing import Optional, Tuple, Type, TypeVar
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import orjson
+from sqlalchemy import bindparam, desc, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.cache.redis import cache_delete, cache_get_many, cache_set
+from app.config import settings
 from app.db.models import Company, RegonData, MfData, ViesData
 
+ProviderRow = TypeVar("ProviderRow", RegonData, MfData)
 
-def get_company_by_nip(db: Session, nip: str) -> Optional[Company]:
+
+def _provider_cache_key(nip: str, provider: str) -> str:
+    """Redis key for a company's latest provider payload."""
+    return f"company:{nip}:{provider}"
+
+
+_SELECT_COMPANY_BY_NIP = select(Company).where(Company.nip == bindparam("nip"))
+
+
+async def get_company_by_nip(db: AsyncSession, nip: str) -> Optional[Company]:
     """Get company by NIP."""
-    return db.query(Company).filter(Company.nip == nip).first()
+    result = await db.execute(_SELECT_COMPANY_BY_NIP, {"nip": nip})
+    return result.scalar_one_or_none()
 
 
-def create_company(db: Session, nip: str, name: Optional[str] = None) -> Company:
-    """Create a new company."""
-    company = Company(nip=nip, name=name)
-    db.add(company)
-    db.commit()
-    db.refresh(company)
+async def _save(db: AsyncSession, commit: bool) -> None:
+    """Commit a new row, or only flush it when the caller commits later.
+
+    Server defaults come back through RETURNING (eager_defaults), so no
+    refresh is needed afterwards.
+    """
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+
+
+async def create_company(
+    db: AsyncSession, nip: str, name: Optional[str] = None, commit: bool = True
+) -> Company:
+    """Create a new company, returning the existing row if the NIP is already taken.
+
+    The no-op DO UPDATE makes RETURNING yield the row on conflict too, so
+    concurrent creators for the same NIP need no extra SELECT or retry.
+    """
+    stmt = insert(Company).values(nip=nip, name=name)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Company.nip], set_={"nip": stmt.excluded.nip}
+    ).returning(Company)
+    company = (await db.scalars(stmt)).one()
+    await _save(db, commit)
     return company
 
 
-def get_or_create_company(db: Session, nip: str, name: Optional[str] = None) -> Company:
+async def get_or_create_company(
+    db: AsyncSession, nip: str, name: Optional[str] = None, commit: bool = True
+) -> Company:
     """Get existing company or create new one."""
-    company = get_company_by_nip(db, nip)
+    company = await get_company_by_nip(db, nip)
     if not company:
-        company = create_company(db, nip, name)
+        company = await create_company(db, nip, name, commit=commit)
     elif name and name != company.name:
         company.name = name  # type: ignore
-        db.commit()
-        db.refresh(company)
+        if commit:
+            await db.commit()
     return company
 
 
-def get_regon_data(db: Session, company_id: int) -> Optional[RegonData]:
+async def get_regon_data(db: AsyncSession, company_id: int) -> Optional[RegonData]:
     """Get latest REGON data for company."""
-    return (
-        db.query(RegonData)
-        .filter(RegonData.company_id == company_id)
+    result = await db.execute(
+        select(RegonData)
+        .where(RegonData.company_id == company_id)
         .order_by(desc(RegonData.fetched_at))
-        .first()
+        .limit(1)
     )
+    return result.scalars().first()
 
 
 def is_regon_data_expired(regon_data: Optional[RegonData]) -> bool:
@@ -50,12 +89,13 @@ def is_regon_data_expired(regon_data: Optional[RegonData]) -> bool:
     return datetime.now(timezone.utc) > regon_data.expires_at  # type: ignore
 
 
-def store_regon_data(
-    db: Session,
+async def store_regon_data(
+    db: AsyncSession,
     company_id: int,
     entity_type: str,
     report_type: str,
-    data: dict
+    data: dict,
+    commit: bool = True
 ) -> RegonData:
     """Store REGON data for company."""
     regon_data = RegonData(
@@ -65,19 +105,19 @@ def store_regon_data(
         data=data
     )
     db.add(regon_data)
-    db.commit()
-    db.refresh(regon_data)
+    await _save(db, commit)
     return regon_data
 
 
-def get_mf_data(db: Session, company_id: int) -> Optional[MfData]:
+async def get_mf_data(db: AsyncSession, company_id: int) -> Optional[MfData]:
     """Get latest MF data for company."""
-    return (
-        db.query(MfData)
-        .filter(MfData.company_id == company_id)
+    result = await db.execute(
+        select(MfData)
+        .where(MfData.company_id == company_id)
         .order_by(desc(MfData.fetched_at))
-        .first()
+        .limit(1)
     )
+    return result.scalars().first()
 
 
 def is_mf_data_expired(mf_data: Optional[MfData]) -> bool:
@@ -87,23 +127,25 @@ def is_mf_data_expired(mf_data: Optional[MfData]) -> bool:
     return datetime.now(timezone.utc) > mf_data.expires_at  # type: ignore
 
 
-def store_mf_data(db: Session, company_id: int, data: dict) -> MfData:
+async def store_mf_data(
+    db: AsyncSession, company_id: int, data: dict, commit: bool = True
+) -> MfData:
     """Store MF data for company."""
     mf_data = MfData(company_id=company_id, data=data)
     db.add(mf_data)
-    db.commit()
-    db.refresh(mf_data)
+    await _save(db, commit)
     return mf_data
 
 
-def get_vies_data(db: Session, company_id: int) -> Optional[ViesData]:
+async def get_vies_data(db: AsyncSession, company_id: int) -> Optional[ViesData]:
     """Get latest VIES data for company."""
-    return (
-        db.query(ViesData)
-        .filter(ViesData.company_id == company_id)
+    result = await db.execute(
+        select(ViesData)
+        .where(ViesData.company_id == company_id)
         .order_by(desc(ViesData.fetched_at))
-        .first()
+        .limit(1)
     )
+    return result.scalars().first()
 
 
 def is_vies_data_expired(vies_data: Optional[ViesData]) -> bool:
@@ -113,11 +155,12 @@ def is_vies_data_expired(vies_data: Optional[ViesData]) -> bool:
     return datetime.now(timezone.utc) > vies_data.expires_at  # type: ignore
 
 
-def store_vies_data(
-    db: Session,
+async def store_vies_data(
+    db: AsyncSession,
     company_id: int,
     data: dict,
-    consultation_number: Optional[str] = None
+    consultation_number: Optional[str] = None,
+    commit: bool = True
 ) -> ViesData:
     """Store VIES data for company."""
     vies_data = ViesData(
@@ -126,6 +169,110 @@ def store_vies_data(
         consultation_number=consultation_number
     )
     db.add(vies_data)
-    db.commit()
-    db.refresh(vies_data)
+    await _save(db, commit)
     return vies_data
+
+
+def _latest_row(model: Type[ProviderRow]):
+    """Lateral subquery selecting a company's newest row of a provider table."""
+    return (
+        select(model)
+        .where(model.company_id == Company.id)
+        .order_by(desc(model.fetched_at))
+        .limit(1)
+        .lateral()
+    )
+
+
+_latest_regon = _latest_row(RegonData)
+_latest_mf = _latest_row(MfData)
+
+# Built once so SQLAlchemy's compiled-statement cache is hit on every call
+_SELECT_COMPANY_WITH_LATEST = (
+    select(Company, aliased(RegonData, _latest_regon), aliased(MfData, _latest_mf))
+    .select_from(Company)
+    .outerjoin(_latest_regon, true())
+    .outerjoin(_latest_mf, true())
+    .where(Company.nip == bindparam("nip"))
+)
+
+
+async def get_company_with_latest(
+    db: AsyncSession, nip: str
+) -> Tuple[Optional[Company], Optional[RegonData], Optional[MfData]]:
+    """Get company with its latest REGON and MF rows in a single query."""
+    result = await db.execute(_SELECT_COMPANY_WITH_LATEST, {"nip": nip})
+    row = result.first()
+    if row is None:
+        return None, None, None
+    return row[0], row[1], row[2]
+
+
+def _load_cached_row(model: Type[ProviderRow], raw: Optional[bytes]) -> Optional[ProviderRow]:
+    """Build a detached row carrying only data/fetched_at/expires_at from a cached payload.
+
+    Cached payloads are a JSON timestamp header and the provider data JSON
+    separated by a newline. The data is wrapped in an orjson.Fragment so it
+    is embedded into the response as-is instead of being parsed and re-encoded.
+    """
+    if not raw or b"\n" not in raw:
+        return None
+    header, data = raw.split(b"\n", 1)
+    timestamps = orjson.loads(header)
+    return model(
+        data=orjson.Fragment(data),
+        fetched_at=datetime.fromisoformat(timestamps["fetched_at"]),
+        expires_at=datetime.fromisoformat(timestamps["expires_at"]),
+    )
+
+
+async def _cache_row(nip: str, provider: str, row: Optional[ProviderRow]) -> None:
+    """Cache a provider row, never keeping it in Redis past its own expiry."""
+    if row is None:
+        return
+    ttl = min(
+        settings.cache_ttl_default,
+        int((row.expires_at - datetime.now(timezone.utc)).total_seconds()),
+    )
+    if ttl > 0:
+        header = orjson.dumps(
+            {"fetched_at": row.fetched_at.isoformat(), "expires_at": row.expires_at.isoformat()}
+        )
+        payload = header + b"\n" + orjson.dumps(row.data)
+        await cache_set(_provider_cache_key(nip, provider), payload, ttl)
+
+
+async def get_company_data_cached(
+    db: AsyncSession, nip: str
+) -> Tuple[Optional[Company], Optional[RegonData], Optional[MfData]]:
+    """Get the latest REGON and MF rows for a NIP, checking Redis first.
+
+    The company is returned only when the database had to be read anyway.
+    It is None in two cases callers can tell apart: both rows came from Redis
+    (the company exists but was not loaded; use get_or_create_company), or the
+    database has no company for the NIP (all three are None; use create_company).
+    """
+    raw_regon, raw_mf = await cache_get_many(
+        _provider_cache_key(nip, "regon"), _provider_cache_key(nip, "mf")
+    )
+    regon = _load_cached_row(RegonData, raw_regon)
+    mf = _load_cached_row(MfData, raw_mf)
+    if regon is not None and mf is not None:
+        return None, regon, mf
+
+    company, db_regon, db_mf = await get_company_with_latest(db, nip)
+    if company is None:
+        return None, None, None
+
+    if regon is None:
+        regon = db_regon
+        await _cache_row(nip, "regon", regon)
+    if mf is None:
+        mf = db_mf
+        await _cache_row(nip, "mf", mf)
+    return company, regon, mf
+
+
+async def invalidate_provider_cache(nip: str, provider: str) -> None:
+    """Drop a company's cached provider payload."""
+    await cache_delete(_provider_cache_key(nip, provider))
@@ -1,132 +1,278 @@
 """CRUD operations for users."""
 
-from typing import Optional
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import bindparam, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.cache.auth_cache import (
+    CachedUser,
+    get_cached_user_by_id,
+    invalidate_cached_user,
+    set_cached_user,
+)
 from app.db.models import User
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    hash_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.security.oauth import OAuthUserInfo
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+def _lookup_cache(db: AsyncSession) -> Dict[Tuple[str, str], int]:
+    """Session-scoped map of (field, value) lookups to user ids.
+
+    Sessions live for one request, so repeat lookups within a request resolve
+    through the identity map via db.get() instead of another query.
+    """
+    return db.info.setdefault("user_lookups", {})
+
+
+# Lookup statements are built once so SQLAlchemy's compiled-statement cache is hit
+_SELECT_USER_BY = {
+    "email": select(User).where(func.lower(User.email) == bindparam("value")),
+    "github_id": select(User).where(User.github_id == bindparam("value")),
+    "google_id": select(User).where(User.google_id == bindparam("value")),
+}
+
+
+async def _get_user_by(db: AsyncSession, field: str, value: str) -> Optional[User]:
+    """Get a user by a unique non-PK field, reusing earlier lookups in this session."""
+    cache = _lookup_cache(db)
+    user_id = cache.get((field, value))
+    if user_id is not None:
+        return await db.get(User, user_id)
+
+    result = await db.execute(_SELECT_USER_BY[field], {"value": value})
+    user = result.scalar_one_or_none()
+    if user is not None:
+        cache[(field, value)] = user.id
+    return user
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    return await _get_user_by(db, "email", email.lower())
 
 
-def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
-
-
-def create_user(db: Session, email: str, password: str, name: Optional[str] = None, plan: str = "free") -> User:
-    """Create a new user."""
-    hashed_password = hash_password(password)
-    user = User(
-        email=email,
-        name=name,
-        password_hash=hashed_password,
-        plan=plan,
-        is_active=True
+    return await db.get(User, user_id)
+
+
+USER_RELATIONS = frozenset({"api_tokens", "subscriptions", "callbacks", "usage_logs"})
+
+
+async def get_user_with_relations(
+    db: AsyncSession, user_id: int, *, want: Iterable[str] = ()
+) -> Optional[User]:
+    """Get user by ID with the requested collections loaded up front.
+
+    Each relationship is fetched with one extra SELECT ... IN query instead
+    of a lazy load per access, which async sessions cannot do anyway.
+    """
+    unknown = set(want) - USER_RELATIONS
+    if unknown:
+        raise ValueError(f"Unknown user relationships: {', '.join(sorted(unknown))}")
+
+    options = [selectinload(getattr(User, relation)) for relation in want]
+    result = await db.execute(select(User).options(*options).where(User.id == user_id))
+    return result.scalar_one_or_none()
+
+
+async def create_user(db: AsyncSession, email: str, password: str, name: Optional[str] = None, plan: str = "free") -> Optional[User]:
+    """Create a new user, returning None if the email is already registered."""
+    hashed_password = await hash_password_async(password)
+    stmt = (
+        insert(User)
+        .values(
+            email=email,
+            name=name,
+            password_hash=hashed_password,
+            plan=plan,
+            is_active=True
+        )
+        .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+        .returning(User)
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    result = await db.execute(stmt)
+    user = result.scalars().one_or_none()
+    _lookup_cache(db).clear()
+    await db.commit()
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """Authenticate user with email and password."""
-    user = get_user_by_email(db, email)
-    if not user:
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """Hash checked against when there is no real one, to keep login timing uniform.
+
+    Built on first use so importing this module does not pay for a bcrypt round.
+    """
+    return hash_password("dummy-password")
+
+
+_SELECT_AUTH_USER_BY_ID = select(
+    User.id, User.email, User.plan, User.is_active, User.oauth_provider
+).where(User.id == bindparam("value"))
+
+# Credentials are always read from the database, never cached; ix_users_auth_lookup
+# covers these columns so login is an index-only scan
+_SELECT_CREDENTIALS_BY_EMAIL = select(User.id, User.is_active, User.password_hash).where(
+    func.lower(User.email) == bindparam("value")
+)
+
+
+async def get_auth_user_by_id(db: AsyncSession, user_id: int) -> Optional[CachedUser]:
+    """Get the authentication fields of a user by ID, checking the auth cache first."""
+    user = await get_cached_user_by_id(user_id)
+    if user is not None:
+        return user
+
+    result = await db.execute(_SELECT_AUTH_USER_BY_ID, {"value": user_id})
+    row = result.first()
+    if row is None:
         return None
-    if not user.password_hash:  # OAuth user without password
+    user = CachedUser(**row._asdict())
+    await set_cached_user(user)
+    return user
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate user with email and password."""
+    # Only the credential fields are needed until the password is verified
+    result = await db.execute(_SELECT_CREDENTIALS_BY_EMAIL, {"value": email.lower()})
+    row = result.first()
+    if not row or not row.password_hash:  # Unknown email or OAuth user without password
+        # Burn a bcrypt check anyway so response time does not reveal which emails exist
+        await verify_password_async(password, _dummy_hash())
         return None
-    if not verify_password(password, user.password_hash): # type: ignore
+    if not await verify_password_async(password, row.password_hash):
         return None
-    if not user.is_active: # type: ignore
+    if not row.is_active:
         return None
+
+    user = await db.get(User, row.id)
+    if user and password_needs_rehash(row.password_hash):
+        # Transparently upgrade hashes made with an outdated cost factor
+        user.password_hash = await hash_password_async(password)
+        await db.commit()
+        await invalidate_cached_user(user.id)
     return user
 
 
-def update_user(db: Session, user_id: int, **kwargs) -> Optional[User]:
+# Mapped column attributes that update_user is allowed to set
+_USER_COLUMNS = frozenset(inspect(User).column_attrs.keys())
+
+
+async def update_user(db: AsyncSession, user_id: int, **kwargs) -> Optional[User]:
     """Update user fields."""
-    user = get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, user_id)
     if not user:
         return None
 
     for field, value in kwargs.items():
-        if hasattr(user, field):
+        if field in _USER_COLUMNS:
             setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    _lookup_cache(db).clear()
+    await db.commit()
+    await invalidate_cached_user(user.id)
     return user
 
 
-def get_user_by_github_id(db: Session, github_id: str) -> Optional[User]:
+async def get_user_by_github_id(db: AsyncSession, github_id: str) -> Optional[User]:
     """Get user by GitHub ID."""
-    return db.query(User).filter(User.github_id == github_id).first()
+    return await _get_user_by(db, "github_id", github_id)
 
 
-def get_user_by_google_id(db: Session, google_id: str) -> Optional[User]:
+async def get_user_by_google_id(db: AsyncSession, google_id: str) -> Optional[User]:
     """Get user by Google ID."""
-    return db.query(User).filter(User.google_id == google_id).first()
-
-
-def create_oauth_user(db: Session, oauth_info: OAuthUserInfo, access_token: str, refresh_token: Optional[str] = None) -> User:
-    """Create a new user from OAuth information."""
-    # Check if user already exists by email
-    existing_user = get_user_by_email(db, oauth_info.email)
-    if existing_user:
-        # Update existing user with OAuth info
-        if oauth_info.provider == "github":
-            existing_user.github_id = oauth_info.provider_id
-            existing_user.github_username = oauth_info.username
-        elif oauth_info.provider == "google":
-            existing_user.google_id = oauth_info.provider_id
-            existing_user.google_email = oauth_info.email
-        
-        existing_user.oauth_provider = oauth_info.provider
-        existing_user.oauth_access_token = access_token
-        existing_user.oauth_refresh_token = refresh_token
-        existing_user.avatar_url = oauth_info.avatar_url
-        if oauth_info.name and not existing_user.name:
-            existing_user.name = oauth_info.name
-        
-        db.commit()
-        db.refresh(existing_user)
-        return existing_user
-    
-    # Create new OAuth user
-    user_data = {
-        "email": oauth_info.email,
-        "name": oauth_info.name,
-        "password_hash": None,  # No password for OAuth users
-        "plan": "free",
-        "is_active": True,
+    return await _get_user_by(db, "google_id", google_id)
+
+
+async def create_oauth_user(db: AsyncSession, oauth_info: OAuthUserInfo, access_token: str, refresh_token: Optional[str] = None) -> User:
+    """Create a user from OAuth information, or link the OAuth account to an existing email."""
+    oauth_data = {
         "oauth_provider": oauth_info.provider,
         "oauth_access_token": access_token,
         "oauth_refresh_token": refresh_token,
         "avatar_url": oauth_info.avatar_url,
     }
-    
     if oauth_info.provider == "github":
-        user_data["github_id"] = oauth_info.provider_id
-        user_data["github_username"] = oauth_info.username
+        oauth_data["github_id"] = oauth_info.provider_id
+        oauth_data["github_username"] = oauth_info.username
     elif oauth_info.provider == "google":
-        user_data["google_id"] = oauth_info.provider_id
-        user_data["google_email"] = oauth_info.email
-    
-    user = User(**user_data)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+        oauth_data["google_id"] = oauth_info.provider_id
+        oauth_data["google_email"] = oauth_info.email
+
+    stmt = insert(User).values(
+        email=oauth_info.email.lower(),
+        name=oauth_info.name,
+        password_hash=None,  # No password for OAuth users
+        plan="free",
+        is_active=True,
+        **oauth_data,
+    )
+    # An existing account keeps its own name and only gains the OAuth fields
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(User.email)],
+        set_={
+            **{key: stmt.excluded[key] for key in oauth_data},
+            "name": func.coalesce(User.name, stmt.excluded.name),
+            "updated_at": func.now(),
+        },
+    ).returning(User)
+
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    user = result.scalars().one()
+    _lookup_cache(db).clear()
+    await db.commit()
+    await invalidate_cached_user(user.id)
+    return user
+
+
+# Column identifying an account per OAuth provider, and the profile field refreshed on each login
+_OAUTH_ACCOUNT_FIELDS = {
+    "github": ("github_id", "github_username"),
+    "google": ("google_id", "google_email"),
+}
+
+
+async def update_oauth_user(db: AsyncSession, oauth_info: OAuthUserInfo) -> Optional[User]:
+    """Refresh the OAuth profile fields of the user linked to this provider account.
+
+    A single UPDATE ... RETURNING both finds and updates the user; returns None
+    if no user is linked to the account yet.
+    """
+    fields = _OAUTH_ACCOUNT_FIELDS.get(oauth_info.provider)
+    if fields is None:
+        return None
+    id_field, profile_field = fields
+    profile_value = oauth_info.username if oauth_info.provider == "github" else oauth_info.email
+
+    stmt = (
+        update(User)
+        .where(getattr(User, id_field) == oauth_info.provider_id)
+        .values({profile_field: profile_value, "avatar_url": oauth_info.avatar_url})
+        .returning(User)
+    )
+    result = await db.execute(stmt, execution_options={"populate_existing": True, "synchronize_session": False})
+    user = result.scalars().one_or_none()
+    if user is None:
+        return None
+
+    await db.commit()
+    await invalidate_cached_user(user.id)
     return user
 
 
-def get_oauth_user(db: Session, provider: str, provider_id: str) -> Optional[User]:
+async def get_oauth_user(db: AsyncSession, provider: str, provider_id: str) -> Optional[User]:
     """Get user by OAuth provider and provider ID."""
     if provider == "github":
-        return get_user_by_github_id(db, provider_id)
+        return await get_user_by_github_id(db, provider_id)
     elif provider == "google":
-        return get_user_by_google_id(db, provider_id)
+        return await get_user_by_google_id(db, provider_id)
     return None
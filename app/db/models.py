@@ -1,27 +1,41 @@
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     Boolean,
     DateTime,
     Text,
     ForeignKey,
     ARRAY,
+    Enum,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import EncryptedText
+
+# Postgres ENUM types for small fixed domains (see the small_domain_enums migration)
+USER_PLAN = Enum("free", "pro", "premium", "enterprise", name="user_plan")
+REGON_ENTITY_TYPE = Enum("P", "F", "LP", "LF", name="regon_entity_type")
+VALIDATION_SCHEDULE = Enum("daily", "weekly", "monthly", "custom", name="validation_schedule")
+CALLBACK_TRIGGER_TYPE = Enum("scheduled", "opportunistic", "on_demand", name="callback_trigger_type")
+CALLBACK_STATUS = Enum("pending", "processing", "completed", "failed", name="callback_status")
+DATA_PROVIDER = Enum("regon", "mf", "vies", "iban", name="data_provider")
+DATA_CHANGE_TYPE = Enum("created", "updated", "deleted", name="data_change_type")
+BANK_ACCOUNT_SOURCE = Enum("mf", "manual", name="bank_account_source")
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=True)
     password_hash = Column(String(255), nullable=True)  # Made nullable for OAuth users
-    plan = Column(String(20), default="free")
+    plan = Column(USER_PLAN, default="free")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -37,8 +51,8 @@ class User(Base):
     # Shared OAuth fields
     avatar_url = Column(String(500), nullable=True)
     oauth_provider = Column(String(50), nullable=True)  # 'github', 'google', etc.
-    oauth_access_token = Column(Text, nullable=True)  # Encrypted storage
-    oauth_refresh_token = Column(Text, nullable=True)  # Encrypted storage
+    oauth_access_token = Column(EncryptedText, nullable=True)
+    oauth_refresh_token = Column(EncryptedText, nullable=True)
 
     # Relationships
     api_tokens = relationship("ApiToken", back_populates="user")
@@ -46,11 +60,25 @@ class User(Base):
     callbacks = relationship("CallbackQueue", back_populates="user")
     usage_logs = relationship("ApiUsage", back_populates="user")
 
+    __table_args__ = (
+        # Covers the login lookup so it is answered by an index-only scan
+        Index(
+            "ix_users_auth_lookup",
+            func.lower(email),
+            unique=True,
+            postgresql_include=[
+                "id", "email", "plan", "is_active", "password_hash", "oauth_provider"
+            ],
+        ),
+    )
+    # Fetch server-generated timestamps via RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class ApiToken(Base):
     __tablename__ = "api_tokens"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -67,11 +95,16 @@ class ApiToken(Base):
     user = relationship("User", back_populates="api_tokens")
     usage_logs = relationship("ApiUsage", back_populates="token")
 
+    __table_args__ = (
+        Index("ix_api_tokens_token_hash", token_hash, unique=True),
+        {"postgresql_with": {"fillfactor": 90}},
+    )
+
 
 class Company(Base):
     __tablename__ = "companies"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     nip = Column(String(10), unique=True, nullable=False, index=True)
     name = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -87,15 +120,18 @@ class Company(Base):
     subscriptions = relationship("UserCompanySubscription", back_populates="company")
     data_changes = relationship("DataChange", back_populates="company")
 
+    # Fetch server-generated timestamps via RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class RegonData(Base):
     __tablename__ = "regon_data"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     company_id = Column(
         Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
-    entity_type = Column(String(2), nullable=False)  # P, F, LP, LF
+    entity_type = Column(REGON_ENTITY_TYPE, nullable=False)
     report_type = Column(String(50), nullable=False)  # BIR11OsPrawna, etc.
     data = Column(JSONB, nullable=False)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -106,13 +142,17 @@ class RegonData(Base):
     # Relationships
     company = relationship("Company", back_populates="regon_data")
 
-    __table_args__ = ({"sqlite_autoincrement": True},)
+    __table_args__ = (
+        Index("ix_regon_data_company_fetched", company_id, fetched_at.desc()),
+        {"sqlite_autoincrement": True},
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class MfData(Base):
     __tablename__ = "mf_data"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     company_id = Column(
         Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
@@ -125,11 +165,16 @@ class MfData(Base):
     # Relationships
     company = relationship("Company", back_populates="mf_data")
 
+    __table_args__ = (
+        Index("ix_mf_data_company_fetched", company_id, fetched_at.desc()),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class ViesData(Base):
     __tablename__ = "vies_data"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     company_id = Column(
         Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
@@ -143,16 +188,21 @@ class ViesData(Base):
     # Relationships
     company = relationship("Company", back_populates="vies_data")
 
+    __table_args__ = (
+        Index("ix_vies_data_company_fetched", company_id, fetched_at.desc()),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class CompanyBankAccount(Base):
     __tablename__ = "company_bank_accounts"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     company_id = Column(
         Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
     account_number = Column(String(50), nullable=False)
-    source = Column(String(20), nullable=False)  # 'mf', 'manual', etc.
+    source = Column(BANK_ACCOUNT_SOURCE, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
@@ -167,7 +217,7 @@ class CompanyBankAccount(Base):
 class IbanEnrichment(Base):
     __tablename__ = "iban_enrichment"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     account_id = Column(
         Integer,
         ForeignKey("company_bank_accounts.id", ondelete="CASCADE"),
@@ -192,7 +242,7 @@ class IbanEnrichment(Base):
 class UserCompanySubscription(Base):
     __tablename__ = "user_company_subscriptions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -201,9 +251,7 @@ class UserCompanySubscription(Base):
     )
     webhook_url = Column(Text, nullable=False)
     providers = Column(ARRAY(String), nullable=False)  # ['regon', 'mf', 'vies']
-    validation_schedule = Column(
-        String(20), nullable=False
-    )  # daily, weekly, monthly, custom
+    validation_schedule = Column(VALIDATION_SCHEDULE, nullable=False)
     custom_interval_hours = Column(Integer)
     last_validated_at = Column(DateTime(timezone=True))
     next_validation_at = Column(DateTime(timezone=True))
@@ -217,56 +265,82 @@ class UserCompanySubscription(Base):
     user = relationship("User", back_populates="subscriptions")
     company = relationship("Company", back_populates="subscriptions")
 
+    __table_args__ = (
+        Index(
+            "ix_user_company_subscriptions_due",
+            next_validation_at,
+            postgresql_where=is_active.is_(True),
+        ),
+        {"postgresql_with": {"fillfactor": 90}},
+    )
+
 
 class CallbackQueue(Base):
     __tablename__ = "callback_queue"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     company_nip = Column(String(10), nullable=False)
     providers = Column(ARRAY(String), nullable=False)  # ['regon', 'mf', 'vies']
     webhook_url = Column(Text, nullable=False)
-    trigger_type = Column(
-        String(20), nullable=False
-    )  # scheduled, opportunistic, on_demand
+    trigger_type = Column(CALLBACK_TRIGGER_TYPE, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     retry_count = Column(Integer, default=0)
     max_retries = Column(Integer, default=3)
     next_retry_at = Column(DateTime(timezone=True))
-    status = Column(
-        String(20), default="pending"
-    )  # pending, processing, completed, failed
+    status = Column(CALLBACK_STATUS, default="pending")
     error_message = Column(Text)
 
     # Relationships
     user = relationship("User", back_populates="callbacks")
     deliveries = relationship("WebhookDelivery", back_populates="callback")
 
+    __table_args__ = (
+        Index(
+            "ix_callback_queue_pending",
+            next_retry_at,
+            postgresql_where=status == "pending",
+        ),
+        {"postgresql_with": {"fillfactor": 90}},
+    )
+
 
 class WebhookDelivery(Base):
     __tablename__ = "webhook_deliveries"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     callback_id = Column(
-        Integer, ForeignKey("callback_queue.id", ondelete="CASCADE"), nullable=False
+        BigInteger, ForeignKey("callback_queue.id", ondelete="CASCADE"), nullable=False
     )
     attempt_number = Column(Integer, nullable=False)
     http_status = Column(Integer)
     response_body = Column(Text)
     response_headers = Column(JSONB)
-    delivered_at = Column(DateTime(timezone=True), server_default=func.now())
+    delivered_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
     success = Column(Boolean, nullable=False)
 
     # Relationships
     callback = relationship("CallbackQueue", back_populates="deliveries")
 
+    # Monthly partitions (see the partition_log_tables migration)
+    __table_args__ = (
+        Index(
+            "ix_webhook_deliveries_callback_id_delivered_at",
+            callback_id,
+            delivered_at.desc(),
+        ),
+        {"postgresql_partition_by": "RANGE (delivered_at)"},
+    )
+
 
 class ApiUsage(Base):
     __tablename__ = "api_usage"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -281,22 +355,30 @@ class ApiUsage(Base):
     providers_rate_limited = Column(ARRAY(String))
     response_status = Column(Integer, nullable=False)
     response_time_ms = Column(Integer)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
 
     # Relationships
     user = relationship("User", back_populates="usage_logs")
     token = relationship("ApiToken", back_populates="usage_logs")
 
+    # Monthly partitions (see the partition_log_tables migration)
+    __table_args__ = (
+        Index("ix_api_usage_user_id_created_at", user_id, created_at.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
 
 class DataChange(Base):
     __tablename__ = "data_changes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigInteger, primary_key=True)
     company_id = Column(
         Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
     )
-    provider = Column(String(20), nullable=False)  # regon, mf, vies, iban
-    change_type = Column(String(20), nullable=False)  # created, updated, deleted
+    provider = Column(DATA_PROVIDER, nullable=False)
+    change_type = Column(DATA_CHANGE_TYPE, nullable=False)
     field_changes = Column(JSONB)
     old_data = Column(JSONB)
     new_data = Column(JSONB)
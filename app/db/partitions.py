@@ -0,0 +1,43 @@
+"""Periodic creation of the monthly partitions of the log tables."""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tables partitioned by month (see the partition_log_tables migration)
+PARTITIONED_TABLES = ("api_usage", "webhook_deliveries")
+
+# Months of partitions kept created ahead of the current one
+PARTITION_MONTHS_AHEAD = 3
+
+# Seconds between partition maintenance runs
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 6 * 3600
+
+_CREATE_MONTHLY_PARTITIONS = text("SELECT create_monthly_partitions(:parent, :months_ahead)")
+
+
+async def create_log_partitions() -> None:
+    """Create any missing monthly partitions of the log tables."""
+    async with AsyncSessionLocal() as db:
+        for table in PARTITIONED_TABLES:
+            await db.execute(
+                _CREATE_MONTHLY_PARTITIONS,
+                {"parent": table, "months_ahead": PARTITION_MONTHS_AHEAD},
+            )
+        await db.commit()
+
+
+async def run_partition_maintenance(interval: float = PARTITION_MAINTENANCE_INTERVAL_SECONDS) -> None:
+    """Create partitions now and then every interval seconds until cancelled."""
+    while True:
+        try:
+            await create_log_partitions()
+        except (SQLAlchemyError, OSError):
+            logger.exception("Creating log table partitions failed")
+        await asyncio.sleep(interval)
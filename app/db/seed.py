@@ -3,80 +3,73 @@
 
 import sys
 import os
-from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 # Add the app directory to the path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from app.db.database import SessionLocal  # noqa: E402
 from app.db.models import User, Company, ApiToken  # noqa: E402
 from app.utils.security import hash_password  # noqa: E402
 from app.config import settings  # noqa: E402
 
+# The app runs on asyncpg; this one-off script uses a plain sync session
+engine = create_engine(settings.sync_database_url)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def seed_admin_user(db: Session) -> None:
-    """Seed the database with an admin user."""
 
-    # Check if admin user already exists
-    admin_user = db.query(User).filter(User.email == settings.admin_email).first()
-    if admin_user:
-        print("✅ Admin user already exists!")
-        return
+ADMIN_TOKEN = "admin-token-123"
+TEST_USER_EMAIL = "test@companyhub.com"
+TEST_USER_PASSWORD = "test123"
 
-    # Determine if password is already hashed (bcrypt hashes start with $2a$, $2b$, or $2y$)
-    admin_password = settings.admin_password
-    if admin_password.startswith(('$2a$', '$2b$', '$2y$')):
-        # Password is already a bcrypt hash, use as-is
-        password_hash = admin_password
-    else:
-        # Password is plain text, hash it
-        password_hash = hash_password(admin_password)
 
-    # Create admin user
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash passwords in parallel; bcrypt is CPU-bound, so use one process per core."""
+    if not passwords:
+        return []
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(hash_password, passwords))
+
+
+def user_exists(db: Session, email: str) -> bool:
+    """Check whether a user with the given email exists."""
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def is_bcrypt_hash(value: str) -> bool:
+    """Check if a value is already a bcrypt hash ($2a$, $2b$ or $2y$ prefix)."""
+    return value.startswith(('$2a$', '$2b$', '$2y$'))
+
+
+def seed_admin_user(db: Session, password_hash: str, token_hash: str) -> None:
+    """Stage the admin user and its API token."""
     admin_user = User(
         email=settings.admin_email,
         name=settings.admin_name,
         password_hash=password_hash,
         plan="enterprise",
-        is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
+        is_active=True
     )
-
-    try:
-        db.add(admin_user)
-        db.commit()
-        db.refresh(admin_user)
-        print("✅ Admin user created successfully!")
-        print(f"   Name: {settings.admin_name}")
-        print(f"   Email: {settings.admin_email}")
-        print(f"   Password: {settings.admin_password}")
-        print("   Plan: enterprise")
-
-        # Create an admin API token
-        admin_token = ApiToken(
-            user_id=admin_user.id,
-            token_name="Admin Token",
-            token_hash=hash_password("admin-token-123"),
-            permissions={"all": True},
-            rate_limit_per_hour=10000,
-            is_active=True,
-            created_at=datetime.now(timezone.utc)
-        )
-
-        db.add(admin_token)
-        db.commit()
-        print("✅ Admin API token created!")
-
-    except IntegrityError as e:
-        db.rollback()
-        print(f"❌ Error creating admin user: {e}")
+    admin_token = ApiToken(
+        user=admin_user,
+        token_name="Admin Token",
+        token_hash=token_hash,
+        permissions={"all": True},
+        rate_limit_per_hour=10000,
+        is_active=True
+    )
+    db.add_all([admin_user, admin_token])
+    print("✅ Admin user and API token staged")
+    print(f"   Name: {settings.admin_name}")
+    print(f"   Email: {settings.admin_email}")
+    print(f"   Password: {settings.admin_password}")
+    print("   Plan: enterprise")
 
 
 def seed_test_companies(db: Session) -> None:
-    """Seed the database with test companies."""
+    """Insert test companies that do not exist yet."""
 
     test_companies = [
         {
@@ -93,61 +86,36 @@ def seed_test_companies(db: Session) -> None:
         }
     ]
 
+    # One query for all existing NIPs instead of one per company
+    nips = [company_data["nip"] for company_data in test_companies]
+    existing_nips = {nip for (nip,) in db.query(Company.nip).filter(Company.nip.in_(nips))}
+
+    missing = []
     for company_data in test_companies:
-        # Check if company already exists
-        existing_company = db.query(Company).filter(Company.nip == company_data["nip"]).first()
-        if existing_company:
+        if company_data["nip"] in existing_nips:
             print(f"✅ Company {company_data['name']} already exists!")
             continue
 
-        # Create company
-        company = Company(
-            nip=company_data["nip"],
-            name=company_data["name"],
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
-
-        try:
-            db.add(company)
-            db.commit()
-            print(f"✅ Created company: {company_data['name']} (NIP: {company_data['nip']})")
-        except IntegrityError as e:
-            db.rollback()
-            print(f"❌ Error creating company {company_data['name']}: {e}")
-
-
-def seed_test_user(db: Session) -> None:
-    """Seed the database with a test user."""
-
-    # Check if test user already exists
-    test_user = db.query(User).filter(User.email == "test@companyhub.com").first()
-    if test_user:
-        print("✅ Test user already exists!")
-        return
-
-    # Create test user
-    test_user = User(
-        email="test@companyhub.com",
-        name="Test User",
-        password_hash=hash_password("test123"),
-        plan="free",
-        is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
-    )
+        missing.append(company_data)
+        print(f"✅ Staged company: {company_data['name']} (NIP: {company_data['nip']})")
 
-    try:
-        db.add(test_user)
-        db.commit()
-        print("✅ Test user created successfully!")
-        print("   Email: test@companyhub.com")
-        print("   Password: test123")
-        print("   Plan: free")
+    # Plain rows with no relationships, so skip the unit of work entirely
+    db.bulk_insert_mappings(Company, missing)
 
-    except IntegrityError as e:
-        db.rollback()
-        print(f"❌ Error creating test user: {e}")
+
+def seed_test_user(db: Session, password_hash: str) -> None:
+    """Stage the test user."""
+    db.add(User(
+        email=TEST_USER_EMAIL,
+        name="Test User",
+        password_hash=password_hash,
+        plan="free",
+        is_active=True
+    ))
+    print("✅ Test user staged")
+    print(f"   Email: {TEST_USER_EMAIL}")
+    print(f"   Password: {TEST_USER_PASSWORD}")
+    print("   Plan: free")
 
 
 def main():
@@ -158,18 +126,38 @@ def main():
     db = SessionLocal()
 
     try:
-        # Seed admin user
-        print("\n📝 Seeding admin user...")
-        seed_admin_user(db)
-
-        # Seed test user
-        print("\n📝 Seeding test user...")
-        seed_test_user(db)
+        seed_admin = not user_exists(db, settings.admin_email)
+        seed_test = not user_exists(db, TEST_USER_EMAIL)
+        if not seed_admin:
+            print("✅ Admin user already exists!")
+        if not seed_test:
+            print("✅ Test user already exists!")
+
+        # Hash every needed password up front, in parallel
+        plaintexts = {}
+        if seed_admin:
+            if not is_bcrypt_hash(settings.admin_password):
+                plaintexts["admin"] = settings.admin_password
+            plaintexts["admin_token"] = ADMIN_TOKEN
+        if seed_test:
+            plaintexts["test"] = TEST_USER_PASSWORD
+        hashes = dict(zip(plaintexts, hash_passwords(list(plaintexts.values()))))
+
+        if seed_admin:
+            print("\n📝 Seeding admin user...")
+            seed_admin_user(
+                db, hashes.get("admin", settings.admin_password), hashes["admin_token"]
+            )
+
+        if seed_test:
+            print("\n📝 Seeding test user...")
+            seed_test_user(db, hashes["test"])
 
-        # Seed test companies
         print("\n📝 Seeding test companies...")
         seed_test_companies(db)
 
+        # Everything is written in a single transaction
+        db.commit()
         print("\n🎉 Database seeding completed successfully!")
 
     except Exception as e:
@@ -0,0 +1,70 @@
+"""Custom SQLAlchemy column types."""
+
+import base64
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy.types import Text, TypeDecorator
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marks values written by EncryptedText; anything else is legacy plaintext
+_PREFIX = "v1:"
+_NONCE_SIZE = 12
+
+
+def _load_key() -> bytes:
+    """Get the 256-bit column encryption key; it must be configured and stable across processes."""
+    if not settings.encryption_key:
+        raise RuntimeError(
+            "ENCRYPTION_KEY is required for encrypted columns "
+            "(generate one with: python -c \"import base64, os; print(base64.urlsafe_b64encode(os.urandom(32)).decode())\")"
+        )
+    key = base64.urlsafe_b64decode(settings.encryption_key)
+    if len(key) != 32:
+        raise RuntimeError("ENCRYPTION_KEY must be the urlsafe base64 encoding of exactly 32 bytes")
+    return key
+
+
+@lru_cache(maxsize=1)
+def get_cipher() -> AESGCM:
+    """Shared AES-GCM cipher, built on first use so importing the models needs no key.
+
+    AESGCM is stateless per call, so one instance is shared. The app calls this
+    at startup to fail fast on a missing or malformed key.
+    """
+    return AESGCM(_load_key())
+
+
+class EncryptedText(TypeDecorator):
+    """Text column stored as AES-GCM ciphertext with a random 12-byte nonce."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = get_cipher().encrypt(nonce, value.encode("utf-8"), None)
+        return _PREFIX + base64.b64encode(nonce + ciphertext).decode("ascii")
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[str]:
+        if value is None or not value.startswith(_PREFIX):
+            return value
+        cipher = get_cipher()
+        try:
+            raw = base64.b64decode(value[len(_PREFIX):])
+            plaintext = cipher.decrypt(raw[:_NONCE_SIZE], raw[_NONCE_SIZE:], None)
+        except (ValueError, InvalidTag):
+            # A rotated key or a corrupted value must not make the whole row unreadable,
+            # but the data loss has to be visible
+            logger.error("Could not decrypt encrypted column value (corrupted, or wrong or rotated ENCRYPTION_KEY); returning None")
+            return None
+        return plaintext.decode("utf-8")
@@ -1,34 +1,30 @@
 """FastAPI dependencies."""
 
-from typing import Generator
+from typing import AsyncGenerator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import SessionLocal
-from app.db.models import User
-from app.crud.users import get_user_by_id
+from app.cache.auth_cache import CachedUser, user_cache_key
+from app.cache.redis import cache_get, cache_set
+from app.config import settings
+from app.db.database import AsyncSessionLocal
+from app.crud.users import get_auth_user_by_id, get_user_by_id
+from app.schemas.auth import UserResponse
 from app.utils.security import verify_token
 
 security = HTTPBearer()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
-    token = credentials.credentials
-    payload = verify_token(token)
+def _get_token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Decode the bearer token and return the user ID it was issued for."""
+    payload = verify_token(credentials.credentials)
 
     if payload is None:
         raise HTTPException(
@@ -45,7 +41,12 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = get_user_by_id(db, user_id=user_id)
+    return int(user_id)
+
+
+async def _get_active_user(db: AsyncSession, user_id: int) -> CachedUser:
+    """Load an active user's authentication fields, from the auth cache when possible, or raise 401."""
+    user = await get_auth_user_by_id(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,7 +54,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not user.is_active: # type: ignore
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
@@ -63,6 +64,41 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> CachedUser:
+    """Get current authenticated user's authentication fields."""
+    user_id = _get_token_user_id(credentials)
+    return await _get_active_user(db, user_id)
+
+
+def get_current_active_user(current_user: CachedUser = Depends(get_current_user)) -> CachedUser:
     """Get current active user."""
     return current_user
+
+
+async def get_current_user_profile(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> UserResponse:
+    """Get current user's profile, served from Redis when cached."""
+    user_id = _get_token_user_id(credentials)
+    # Checked on every request, even on a profile cache hit, so deactivated users are rejected at once
+    await _get_active_user(db, user_id)
+
+    cache_key = user_cache_key(user_id)
+    cached = await cache_get(cache_key)
+    if cached:
+        return UserResponse.model_validate_json(cached)
+
+    user = await get_user_by_id(db, user_id=user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    profile = UserResponse.model_validate(user)
+    await cache_set(cache_key, profile.model_dump_json(), settings.cache_ttl_user)
+    return profile
@@ -1,31 +1,41 @@
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from app.config import settings
 
+# Parsed once; the handler runs on every error response
+_ORIGIN_LIST = settings.cors_origins.split(",")
+_ALLOWED_ORIGINS = frozenset(_ORIGIN_LIST)
+_ALLOW_ANY = "*" in _ALLOWED_ORIGINS
+_FALLBACK_ORIGIN = _ORIGIN_LIST[0] if _ORIGIN_LIST else "*"
+
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Custom HTTP exception handler that ensures CORS headers are included
     in error responses.
     """
+    origin = request.headers.get("Origin")
+
+    # Non-browser callers (servers, health checks, webhooks) need no CORS headers
+    if origin is None:
+        return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+
     headers = {
-        "Access-Control-Allow-Origin": request.headers.get("Origin", "*"),
+        **(exc.headers or {}),
         "Access-Control-Allow-Credentials": "true",
         "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
         "Access-Control-Allow-Headers": "*",
     }
 
-    # Only set origin header if it's in allowed origins
-    origin = request.headers.get("Origin")
-    allowed_origins = settings.cors_origins.split(",")
-    if origin and origin in allowed_origins:
+    # Only echo the origin back if it's in allowed origins
+    if origin in _ALLOWED_ORIGINS:
         headers["Access-Control-Allow-Origin"] = origin
-    elif "*" in allowed_origins:
+    elif _ALLOW_ANY:
         headers["Access-Control-Allow-Origin"] = "*"
     else:
-        headers["Access-Control-Allow-Origin"] = allowed_origins[0] if allowed_origins else "*"
+        headers["Access-Control-Allow-Origin"] = _FALLBACK_ORIGIN
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
         headers=headers
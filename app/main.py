@@ -1,34 +1,67 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.v1.router import api_router
 from app.config import settings
+from app.cache.redis import close_redis
+from app.db.partitions import run_partition_maintenance
+from app.db.types import get_cipher
+from app.providers.regon import regon_provider
+from app.providers.mf import mf_provider
+from app.providers.iban import iban_enrichment_client
 from app.exception_handlers import http_exception_handler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.WARNING,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (skip when the server already installed root handlers)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
 
 # Set specific loggers to DEBUG for more detailed output
-# logging.getLogger("app.providers.regon").setLevel(logging.DEBUG)
-# logging.getLogger("app.providers.iban").setLevel(logging.DEBUG)
-# logging.getLogger("app.providers.mf").setLevel(logging.DEBUG)
+for _logger_name in filter(None, (n.strip() for n in settings.debug_loggers.split(","))):
+    logging.getLogger(_logger_name).setLevel(logging.DEBUG)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check the encryption key and start partition maintenance on startup; release shared connections on shutdown."""
+    # Fail at startup rather than on the first OAuth token read or write
+    get_cipher()
+    partitions = asyncio.create_task(run_partition_maintenance())
+    yield
+    partitions.cancel()
+    with suppress(asyncio.CancelledError):
+        await partitions
+    await regon_provider.aclose()
+    await mf_provider.aclose()
+    await iban_enrichment_client.close()
+    await close_redis()
+
 
 app = FastAPI(
     title="CompanyHub API",
     description="Centralized API service for Polish company data aggregation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
+_CORS_ORIGINS = tuple(settings.cors_origins.split(","))
+_CORS_METHODS = tuple(m.strip() for m in settings.cors_allow_methods.split(","))
+_CORS_HEADERS = (
+    ("*",)
+    if settings.cors_allow_headers == "*"
+    else tuple(h.strip() for h in settings.cors_allow_headers.split(","))
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
+    allow_origins=_CORS_ORIGINS,
     allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods.split(","),
-    allow_headers=settings.cors_allow_headers.split(",") if settings.cors_allow_headers != "*" else ["*"],
+    allow_methods=_CORS_METHODS,
+    allow_headers=_CORS_HEADERS,
 )
 
 # Add HTTP exception handler to ensure CORS headers are included
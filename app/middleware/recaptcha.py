@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status, Request
-from typing import Optional, Callable
+from typing import Optional
 from app.security.recaptcha import recaptcha_service
 from app.config import settings
 import logging
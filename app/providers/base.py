@@ -1,6 +1,26 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Delay assumed when a 429 carries no usable Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER_SECONDS) -> float:
+    """Seconds to wait according to a Retry-After header given as delta-seconds or an HTTP-date."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
 
 class BaseProvider(ABC):
@@ -60,6 +80,16 @@ class BaseProvider(ABC):
         """
         pass
 
+    async def aclose(self) -> None:
+        """Release any network resources held by the provider."""
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
 
 class ProviderError(Exception):
     """Base exception for provider errors."""
@@ -87,3 +117,10 @@ class ValidationError(ProviderError):
 
     def __init__(self, message: str, provider: str):
         super().__init__(message, provider, 400)
+
+
+class CircuitOpenError(ProviderError):
+    """Exception raised when a provider is skipped because its circuit breaker is open."""
+
+    def __init__(self, provider: str):
+        super().__init__(f"Circuit open for {provider}", provider, 503)
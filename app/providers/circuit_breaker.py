@@ -0,0 +1,47 @@
+"""In-process circuit breaker used to skip providers that keep failing."""
+
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """Open after consecutive failures, then let one probe through per cooldown until a call succeeds."""
+
+    __slots__ = ("threshold", "max_cooldown", "failures", "open_until")
+
+    def __init__(self, threshold: int = 5, max_cooldown: float = 60.0):
+        self.threshold = threshold
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def _cooldown(self) -> float:
+        """Seconds to stay open, doubling with each failure up to max_cooldown."""
+        return min(self.max_cooldown, 2.0 ** self.failures)
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether a call may proceed; once the cooldown has passed only a single probe is let through."""
+        now = time.monotonic() if now is None else now
+        if now < self.open_until:
+            return False
+        if self.failures < self.threshold:
+            return True
+        # Half-open: hold the circuit open for other callers while this probe runs
+        self.open_until = now + self._cooldown()
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        """Count a failure, opening the circuit once the threshold is reached."""
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = (time.monotonic() if now is None else now) + self._cooldown()
+
+    def hold(self, seconds: float, now: Optional[float] = None) -> None:
+        """Keep the circuit open for the given time, e.g. when the provider asked us to retry later."""
+        now = time.monotonic() if now is None else now
+        self.open_until = max(self.open_until, now + seconds)
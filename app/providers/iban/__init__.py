@@ -1,10 +1,11 @@
 """IBAN enrichment provider module."""
 
-from .client import IbanEnrichmentClient
+from .client import IbanEnrichmentClient, iban_enrichment_client
 from .models import BankDetails, IbanValidationResult
 
 __all__ = [
     "IbanEnrichmentClient",
+    "iban_enrichment_client",
     "BankDetails",
     "IbanValidationResult",
 ]
@@ -2,100 +2,74 @@
 
 import logging
 import httpx
+import orjson
 from typing import Dict, Any, Optional
+from app.providers.base import CircuitOpenError, parse_retry_after
+from .base import IbanProvider
 from .models import BankDetails, IbanValidationResult
 
 logger = logging.getLogger(__name__)
 
 
-class APILayerBankDataAPI:
+class APILayerBankDataAPI(IbanProvider):
     """Client for APILayer Bank Data API - professional IBAN validation service."""
 
+    source = "apilayer"
+
     def __init__(self, api_key: Optional[str] = None, timeout: int = 10):
-        self.base_url = "https://api.apilayer.com/bank_data"
+        headers = {"apikey": api_key, "Content-Type": "application/json"} if api_key else None
+        super().__init__("https://api.apilayer.com/bank_data", timeout, headers=headers)
         self.api_key = api_key
-        self.timeout = timeout
+        self._validate_url = f"{self.base_url}/iban_validate"
 
-    async def validate_iban(self, iban: str) -> IbanValidationResult:
-        """Validate IBAN and get bank details using APILayer Bank Data API."""
+    async def validate_iban_clean(self, clean_iban: str, original_iban: Optional[str] = None) -> IbanValidationResult:
+        """Validate an already normalized IBAN with the provider's API."""
+        iban = original_iban if original_iban is not None else clean_iban
 
-        if not self.api_key:
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message="APILayer API key not configured",
-                validation_source="apilayer"
-            )
-
-        if not iban or not isinstance(iban, str):
-            return IbanValidationResult(
-                original_iban=str(iban),
-                is_valid=False,
-                error_message="Invalid IBAN input",
-                validation_source="apilayer"
-            )
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source)
 
-        # Clean IBAN (remove spaces)
-        clean_iban = iban.replace(" ", "").upper()
+        if not self.api_key:
+            return self._failure(iban, "APILayer API key not configured")
 
         try:
-            url = f"{self.base_url}/iban_validate"
             params = {"iban": clean_iban}
-            headers = {
-                "apikey": self.api_key,
-                "Content-Type": "application/json"
-            }
-
-            logger.debug(f"Making APILayer request to {url}")
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params, headers=headers)
-
-                logger.debug(f"APILayer response: {response.status_code}")
-
-                if response.status_code == 429:
-                    return IbanValidationResult(
-                        original_iban=iban,
-                        is_valid=False,
-                        error_message="API rate limit exceeded",
-                        validation_source="apilayer"
-                    )
-
-                if response.status_code == 401:
-                    return IbanValidationResult(
-                        original_iban=iban,
-                        is_valid=False,
-                        error_message="Invalid API key",
-                        validation_source="apilayer"
-                    )
-
-                if response.status_code != 200:
-                    return IbanValidationResult(
-                        original_iban=iban,
-                        is_valid=False,
-                        error_message=f"HTTP {response.status_code}: {response.text}",
-                        validation_source="apilayer"
-                    )
-
-                data = response.json()
-                return self._parse_apilayer_response(iban, clean_iban, data)
+
+            logger.debug("Making APILayer request to %s", self._validate_url)
+
+            response = await self._get_client().get(self._validate_url, params=params)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            logger.debug("APILayer response: %s", response.status_code)
+
+            if response.status_code == 429:
+                # Skip this provider for as long as it asked us to back off
+                self.breaker.hold(parse_retry_after(response.headers.get("Retry-After")))
+                return self._failure(iban, "API rate limit exceeded")
+
+            if response.status_code == 401:
+                return self._failure(iban, "Invalid API key")
+
+            if response.status_code != 200:
+                return self._failure(iban, f"HTTP {response.status_code}: {response.text}")
+
+            data = orjson.loads(response.content)
+            return self._parse_apilayer_response(iban, clean_iban, data)
 
         except httpx.TimeoutException:
-            logger.error(f"APILayer API timeout for IBAN {iban}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message="API timeout",
-                validation_source="apilayer"
-            )
+            logger.error("APILayer API timeout for IBAN %s", iban)
+            self.breaker.record_failure()
+            return self._failure(iban, "API timeout")
+        except orjson.JSONDecodeError:
+            logger.error("APILayer API returned invalid JSON for IBAN %s", iban)
+            return self._failure(iban, "Invalid JSON response")
         except Exception as e:
-            logger.error(f"APILayer API error for IBAN {iban}: {str(e)}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message=f"API error: {str(e)}",
-                validation_source="apilayer"
-            )
+            logger.error("APILayer API error for IBAN %s: %s", iban, e)
+            self.breaker.record_failure()
+            return self._failure(iban, f"API error: {str(e)}")
 
     def _parse_apilayer_response(
         self,
@@ -109,13 +83,7 @@ class APILayerBankDataAPI:
             is_valid = data.get("valid", False)
 
             if not is_valid:
-                return IbanValidationResult(
-                    original_iban=original_iban,
-                    formatted_iban=clean_iban,
-                    is_valid=False,
-                    error_message=data.get("error", {}).get("info", "Invalid IBAN"),
-                    validation_source="apilayer"
-                )
+                return self._failure(original_iban, data.get("error", {}).get("info", "Invalid IBAN"), formatted_iban=clean_iban)
 
             # Extract bank details from APILayer response
             bank_details = BankDetails(
@@ -143,14 +111,8 @@ class APILayerBankDataAPI:
             )
 
         except Exception as e:
-            logger.error(f"Error parsing APILayer response: {str(e)}")
-            return IbanValidationResult(
-                original_iban=original_iban,
-                formatted_iban=clean_iban,
-                is_valid=False,
-                error_message=f"Response parsing error: {str(e)}",
-                validation_source="apilayer"
-            )
+            logger.error("Error parsing APILayer response: %s", e)
+            return self._failure(original_iban, f"Response parsing error: {str(e)}", formatted_iban=clean_iban)
 
     def _safe_get(self, data: Any, key: str, default: Any = "") -> Any:
         """Safely get value from dict structure."""
@@ -0,0 +1,84 @@
+"""Shared plumbing for the IBAN validation providers."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+import httpx
+from app.providers.base import CircuitOpenError
+from app.providers.circuit_breaker import CircuitBreaker
+from app.utils.validators import normalize_iban, validate_iban
+from .models import IbanValidationResult
+
+
+class IbanProvider(ABC):
+    """Base class for IBAN providers: lazy shared HTTP client, circuit breaker and local pre-validation."""
+
+    # Identifies the provider in results and circuit breaker errors
+    source: str = ""
+
+    def __init__(self, base_url: str, timeout: int = 10, headers: Optional[Dict[str, str]] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self._headers = headers
+        self._client: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                headers=self._headers,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=1000,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def validate_iban(self, iban: str) -> IbanValidationResult:
+        """Validate IBAN and get bank details from this provider."""
+        if not iban or not isinstance(iban, str):
+            return self._failure(str(iban), "Invalid IBAN input")
+
+        clean_iban = normalize_iban(iban)
+        # Malformed IBANs and checksum failures never need a network round-trip
+        if not validate_iban(clean_iban):
+            return self._failure(iban, "Invalid IBAN format or checksum", clean_iban)
+
+        try:
+            return await self.validate_iban_clean(clean_iban, original_iban=iban)
+        except CircuitOpenError:
+            return self._failure(iban, "Provider temporarily unavailable", clean_iban)
+
+    @abstractmethod
+    async def validate_iban_clean(self, clean_iban: str, original_iban: Optional[str] = None) -> IbanValidationResult:
+        """Validate an IBAN that is already normalized (no spaces, upper case).
+
+        Raises CircuitOpenError while the provider's circuit breaker is open.
+        """
+        pass
+
+    def _failure(self, iban: str, message: str, formatted_iban: str = "") -> IbanValidationResult:
+        """Build a failed validation result attributed to this provider."""
+        return IbanValidationResult(
+            original_iban=iban,
+            formatted_iban=formatted_iban,
+            is_valid=False,
+            error_message=message,
+            validation_source=self.source
+        )
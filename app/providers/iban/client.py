@@ -1,14 +1,45 @@
 """IBAN enrichment client with multiple provider support and fallbacks."""
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from app.config import settings
+from app.providers.base import CircuitOpenError
+from app.utils.ttl_cache import TTLCache
+from app.utils.validators import normalize_iban, validate_iban
 from .models import IbanValidationResult
 from .openiban_api import OpenIBANAPI
 from .apilayer_api import APILayerBankDataAPI
 from .ibanapi_com import IbanApiComClient
+from .local_banks import lookup_local_bank
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent lookups in batch_enrich_accounts
+BATCH_ENRICH_CONCURRENCY = 50
+
+# Enrichment results are cached per IBAN; failures expire sooner so transient outages recover
+IBAN_CACHE_TTL_SECONDS = 86_400
+IBAN_NEGATIVE_CACHE_TTL_SECONDS = 300
+IBAN_CACHE_MAX_ENTRIES = 50_000
+
+# BankDetails fields copied into enrichment results (empty strings become None)
+_ENRICHMENT_BANK_FIELDS = (
+    "bank_name",
+    "bic",
+    "bank_code",
+    "branch_code",
+    "bank_city",
+    "bank_country",
+    "bank_country_code",
+    "currency",
+)
+
+
+def _has_bank_details(result: Optional[IbanValidationResult]) -> bool:
+    """Whether a provider result is a valid IBAN with bank details."""
+    return result is not None and result.is_valid and result.bank_details is not None
+
 
 class IbanEnrichmentClient:
     """
@@ -17,13 +48,41 @@ class IbanEnrichmentClient:
     Uses IbanApi.com as primary (free tier available) with OpenIBAN and APILayer as fallbacks.
     """
 
-    def __init__(self, ibanapi_com_key: Optional[str] = None, apilayer_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        ibanapi_com_key: Optional[str] = None,
+        apilayer_api_key: Optional[str] = None,
+        hedge_delay_ms: Optional[int] = 200,
+    ):
         self.ibanapi_com = IbanApiComClient(api_key=ibanapi_com_key) if ibanapi_com_key else None
         self.openiban_api = OpenIBANAPI()
-        self.apilayer_api = APILayerBankDataAPI(api_key=apilayer_api_key)
+        self.apilayer_api = APILayerBankDataAPI(api_key=apilayer_api_key) if apilayer_api_key else None
+        # Free providers in order of preference: IbanApi.com (when configured), then OpenIBAN
+        self._free_providers: Tuple[Tuple[str, Any], ...] = tuple(
+            (name, api)
+            for name, api in (("IbanApi.com", self.ibanapi_com), ("OpenIBAN", self.openiban_api))
+            if api is not None
+        )
+        # Delay before OpenIBAN is raced against IbanApi.com; None queries them strictly in sequence
+        self.hedge_delay_ms = hedge_delay_ms
+        self._cache: "TTLCache[str, Dict[str, Any]]" = TTLCache(IBAN_CACHE_MAX_ENTRIES, IBAN_CACHE_TTL_SECONDS)
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+        logger.debug("IBAN Enrichment Client initialized - IbanApi.com: %s, OpenIBAN: True, APILayer: %s", bool(self.ibanapi_com), bool(self.apilayer_api))
+
+    async def close(self) -> None:
+        """Close the HTTP clients of all IBAN providers."""
+        if self.ibanapi_com:
+            await self.ibanapi_com.aclose()
+        await self.openiban_api.aclose()
+        if self.apilayer_api:
+            await self.apilayer_api.aclose()
 
-        logger.debug(f"IBAN Enrichment Client initialized - IbanApi.com: {bool(self.ibanapi_com)}, OpenIBAN: True, APILayer: {bool(apilayer_api_key)}")
+    async def __aenter__(self):
+        return self
 
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
     async def enrich_bank_account(self, account_number: str) -> Dict[str, Any]:
         """
@@ -37,88 +96,158 @@ class IbanEnrichmentClient:
         """
 
         if not account_number or not isinstance(account_number, str):
-            logger.debug(f"Invalid account number: {account_number}")
+            logger.debug("Invalid account number: %s", account_number)
             return self._create_empty_enrichment(account_number, "Invalid account number")
 
         # Clean and validate IBAN format
-        clean_iban = account_number.replace(" ", "").upper()
+        clean_iban = normalize_iban(account_number)
 
-        if not self._is_valid_iban_format(clean_iban):
-            logger.debug(f"Invalid IBAN format: {clean_iban}")
+        if not validate_iban(clean_iban):
+            logger.debug("Invalid IBAN format: %s", clean_iban)
             return self._create_empty_enrichment(account_number, "Invalid IBAN format")
 
-        # Try primary API (IbanApi.com - free tier with API key)
-        if self.ibanapi_com:
-            logger.debug(f"Trying IbanApi.com for {clean_iban}")
-            try:
-                result = await self.ibanapi_com.validate_iban(clean_iban)
-                logger.debug(f"IbanApi.com result for {clean_iban}: valid={result.is_valid}, has_bank_details={result.bank_details is not None}")
-
-                if result.is_valid and result.bank_details:
-                    logger.debug(f"Successfully enriched IBAN {clean_iban} using IbanApi.com")
-                    return self._format_enrichment_result(result)
-                elif result.is_valid:
-                    logger.debug(f"IbanApi.com validated IBAN {clean_iban} but no bank details available")
-
-            except Exception as e:
-                logger.warning(f"IbanApi.com API failed for IBAN {clean_iban}: {str(e)}")
-
-        # Try fallback API (OpenIBAN - free)
-        logger.debug(f"Trying OpenIBAN for {clean_iban}")
-        try:
-            result = await self.openiban_api.validate_iban(clean_iban)
-            logger.debug(f"OpenIBAN result for {clean_iban}: valid={result.is_valid}, has_bank_details={result.bank_details is not None}")
-
-            if result.is_valid and result.bank_details:
-                logger.debug(f"Successfully enriched IBAN {clean_iban} using OpenIBAN")
-                return self._format_enrichment_result(result)
-            elif result.is_valid:
-                logger.debug(f"OpenIBAN validated IBAN {clean_iban} but no bank details available")
-                # Return valid IBAN without enrichment
-                return {
-                    "account_number": account_number,
-                    "formatted_iban": clean_iban,
-                    "validated": True,  # IBAN is valid
-                    "bank_name": None,
-                    "bic": None,
-                    "swift_code": None,
-                    "enrichment_available": False,
-                    "enrichment_source": "openiban",
-                    "enriched_at": None,
-                    "enrichment_error": "Bank details not available from free service"
-                }
-
-        except Exception as e:
-            logger.warning(f"OpenIBAN API failed for IBAN {clean_iban}: {str(e)}")
+        # Results are shared per IBAN; each caller gets its own copy carrying the account number it passed
+        return {**await self._enrich_clean(clean_iban), "account_number": account_number}
+
+    async def _enrich_clean(self, clean_iban: str) -> Dict[str, Any]:
+        """Enrich a validated IBAN from local bank codes, the cache or a shared upstream lookup."""
+        # Banks in the bundled bank-code tables are resolved without any API call
+        local_bank = lookup_local_bank(clean_iban)
+        if local_bank is not None:
+            logger.debug("Enriched IBAN %s from local bank codes", clean_iban)
+            return self._format_enrichment_result(
+                IbanValidationResult(
+                    original_iban=clean_iban,
+                    formatted_iban=clean_iban,
+                    is_valid=True,
+                    bank_details=local_bank,
+                    validation_source="local",
+                )
+            )
+
+        cached = self._cache.get(clean_iban)
+        if cached is not None:
+            return cached
+
+        # Share one upstream lookup between concurrent requests for the same IBAN; it runs in
+        # its own task so a cancelled caller does not cancel it for the others
+        task = self._inflight.get(clean_iban)
+        if task is None:
+            task = asyncio.create_task(self._lookup_and_cache(clean_iban))
+            self._inflight[clean_iban] = task
+            task.add_done_callback(lambda t: self._forget_inflight(clean_iban, t))
+        return await asyncio.shield(task)
+
+    async def _lookup_and_cache(self, clean_iban: str) -> Dict[str, Any]:
+        """Look an IBAN up upstream and cache the result, failures for a shorter time."""
+        enrichment = await self._lookup(clean_iban)
+        ttl = IBAN_CACHE_TTL_SECONDS if enrichment.get("enrichment_available") else IBAN_NEGATIVE_CACHE_TTL_SECONDS
+        self._cache.set(clean_iban, enrichment, ttl)
+        return enrichment
+
+    def _forget_inflight(self, clean_iban: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Drop a finished lookup from the in-flight table."""
+        if self._inflight.get(clean_iban) is task:
+            del self._inflight[clean_iban]
+        # Mark the exception retrieved in case every waiting request has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def _lookup(self, clean_iban: str) -> Dict[str, Any]:
+        """Query the IBAN providers in order of preference."""
+        # Free providers first, in the order of self._free_providers
+        if self.hedge_delay_ms is None:
+            enriched, results = await self._query_free_providers(clean_iban)
+        else:
+            enriched, results = await self._race_free_providers(clean_iban)
+        if enriched:
+            return self._format_enrichment_result(enriched)
+
+        openiban_result = results.get("OpenIBAN")
+        if openiban_result and openiban_result.is_valid:
+            # Return valid IBAN without enrichment
+            return {
+                "account_number": clean_iban,
+                "formatted_iban": clean_iban,
+                "validated": True,  # IBAN is valid
+                "bank_name": None,
+                "bic": None,
+                "swift_code": None,
+                "enrichment_available": False,
+                "enrichment_source": "openiban",
+                "enriched_at": None,
+                "enrichment_error": "Bank details not available from free service"
+            }
 
         # Try final fallback API (APILayer - paid)
-        try:
-            result = await self.apilayer_api.validate_iban(clean_iban)
-            logger.debug(f"APILayer result for {clean_iban}: valid={result.is_valid}, has_bank_details={result.bank_details is not None}")
-
-            if result.is_valid and result.bank_details:
-                logger.debug(f"Successfully enriched IBAN {clean_iban} using APILayer")
+        if self.apilayer_api:
+            result = await self._query_provider("APILayer", self.apilayer_api, clean_iban)
+            if _has_bank_details(result):
                 return self._format_enrichment_result(result)
-            elif result.is_valid:
-                logger.debug(f"APILayer validated IBAN {clean_iban} but no bank details available")
-
-        except Exception as e:
-            logger.warning(f"APILayer API failed for IBAN {clean_iban}: {str(e)}")
 
         # All APIs failed to provide bank details, but IBAN might still be valid
-        logger.warning(f"All IBAN enrichment APIs failed to provide bank details for {clean_iban}")
-        return self._create_empty_enrichment(account_number, "No bank details available from any API")
-
-    def _is_valid_iban_format(self, iban: str) -> bool:
-        """Basic IBAN format validation."""
-        if not iban or len(iban) < 15 or len(iban) > 34:
-            return False
-
-        # Check if starts with 2 letters (country code) followed by digits
-        if not (iban[:2].isalpha() and iban[2:4].isdigit()):
-            return False
+        logger.warning("All IBAN enrichment APIs failed to provide bank details for %s", clean_iban)
+        return self._create_empty_enrichment(clean_iban, "No bank details available from any API")
 
-        return True
+    async def _query_provider(self, name: str, api: Any, clean_iban: str) -> Optional[IbanValidationResult]:
+        """Validate an IBAN with one provider, returning None if the call failed."""
+        logger.debug("Trying %s for %s", name, clean_iban)
+        try:
+            result = await api.validate_iban_clean(clean_iban)
+        except CircuitOpenError:
+            logger.debug("Skipping %s for %s: circuit open", name, clean_iban)
+            return None
+        except Exception as e:
+            logger.warning("%s API failed for IBAN %s: %s", name, clean_iban, e)
+            return None
+
+        logger.debug("%s result for %s: valid=%s, has_bank_details=%s", name, clean_iban, result.is_valid, result.bank_details is not None)
+        if result.is_valid and result.bank_details:
+            logger.debug("Successfully enriched IBAN %s using %s", clean_iban, name)
+        elif result.is_valid:
+            logger.debug("%s validated IBAN %s but no bank details available", name, clean_iban)
+        return result
+
+    async def _query_free_providers(
+        self, clean_iban: str
+    ) -> Tuple[Optional[IbanValidationResult], Dict[str, Optional[IbanValidationResult]]]:
+        """Query the free providers in order; return (result with bank details, results by provider)."""
+        results: Dict[str, Optional[IbanValidationResult]] = {}
+        for name, api in self._free_providers:
+            result = results[name] = await self._query_provider(name, api, clean_iban)
+            if _has_bank_details(result):
+                return result, results
+        return None, results
+
+    async def _race_free_providers(
+        self, clean_iban: str
+    ) -> Tuple[Optional[IbanValidationResult], Dict[str, Optional[IbanValidationResult]]]:
+        """Like _query_free_providers, but start the fallbacks if the primary has not answered within the hedge delay."""
+        (primary_name, primary_api), *fallbacks = self._free_providers
+        if not fallbacks:
+            return await self._query_free_providers(clean_iban)
+
+        primary = asyncio.create_task(self._query_provider(primary_name, primary_api, clean_iban))
+        tasks = {primary: primary_name}
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay_ms / 1000)
+            if primary in done and _has_bank_details(primary.result()):
+                return primary.result(), {primary_name: primary.result()}
+
+            for name, api in fallbacks:
+                task = asyncio.create_task(self._query_provider(name, api, clean_iban))
+                tasks[task] = name
+                pending.add(task)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if _has_bank_details(task.result()):
+                        return task.result(), {tasks[task]: task.result()}
+            return None, {name: task.result() for task, name in tasks.items()}
+        finally:
+            for task in pending:
+                task.cancel()
 
     def _format_enrichment_result(self, result: IbanValidationResult) -> Dict[str, Any]:
         """Format validation result into enrichment data."""
@@ -127,29 +256,23 @@ class IbanEnrichmentClient:
         if not bank_details:
             return self._create_empty_enrichment(result.original_iban, "No bank details available")
 
-        return {
+        enrichment = {
             "account_number": result.original_iban,
             "formatted_iban": result.formatted_iban,
             "validated": result.is_valid,
-            "bank_name": bank_details.bank_name if bank_details.bank_name else None,
-            "bic": bank_details.bic if bank_details.bic else None,
-            "swift_code": bank_details.bic if bank_details.bic else None,  # BIC and SWIFT are the same
-            "bank_code": bank_details.bank_code if bank_details.bank_code else None,
-            "branch_code": bank_details.branch_code if bank_details.branch_code else None,
-            "bank_city": bank_details.bank_city if bank_details.bank_city else None,
-            "bank_country": bank_details.bank_country if bank_details.bank_country else None,
-            "bank_country_code": bank_details.bank_country_code if bank_details.bank_country_code else None,
-            "currency": bank_details.currency if bank_details.currency else None,
-            "enrichment_source": bank_details.source_api if bank_details.source_api else None,
-            "enriched_at": bank_details.enriched_at,
-            "enrichment_available": True
         }
+        enrichment.update({f: getattr(bank_details, f) or None for f in _ENRICHMENT_BANK_FIELDS})
+        enrichment["swift_code"] = enrichment["bic"]  # BIC and SWIFT are the same
+        enrichment["enrichment_source"] = bank_details.source_api or None
+        enrichment["enriched_at"] = bank_details.enriched_timestamp()
+        enrichment["enrichment_available"] = True
+        return enrichment
 
     def _create_empty_enrichment(self, account_number: str, reason: str = "") -> Dict[str, Any]:
         """Create empty enrichment result."""
         return {
             "account_number": account_number,
-            "formatted_iban": account_number.replace(" ", "").upper() if account_number else None,
+            "formatted_iban": normalize_iban(account_number) if account_number else None,
             "validated": False,
             "bank_name": None,
             "bic": None,
@@ -176,15 +299,35 @@ class IbanEnrichmentClient:
         Returns:
             Dict mapping account numbers to enrichment data
         """
-        results = {}
+        semaphore = asyncio.Semaphore(BATCH_ENRICH_CONCURRENCY)
+
+        async def enrich(account_number: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.enrich_bank_account(account_number)
+
+        # Each distinct account is looked up once; invalid entries never reach the network
+        unique = list(dict.fromkeys(
+            account_number.strip()
+            for account_number in account_numbers
+            if isinstance(account_number, str) and account_number.strip()
+        ))
+        enriched = dict(zip(unique, await asyncio.gather(*(enrich(a) for a in unique))))
 
+        results = {}
         for account_number in account_numbers:
             if isinstance(account_number, str) and account_number.strip():
                 clean_account = account_number.strip()
-                results[clean_account] = await self.enrich_bank_account(clean_account)
+                results[clean_account] = enriched[clean_account]
             else:
                 results[str(account_number)] = self._create_empty_enrichment(
                     str(account_number), "Invalid account number format"
                 )
 
         return results
+
+
+# Global IBAN enrichment client instance
+iban_enrichment_client = IbanEnrichmentClient(
+    ibanapi_com_key=settings.ibanapi_com_key or None,
+    apilayer_api_key=settings.apilayer_api_key or None,
+)
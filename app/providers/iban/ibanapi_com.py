@@ -2,76 +2,71 @@
 
 import logging
 import httpx
-from typing import Dict, Any
+import orjson
+from typing import Dict, Any, Optional
+from app.providers.base import CircuitOpenError, parse_retry_after
+from .base import IbanProvider
 from .models import BankDetails, IbanValidationResult
 
 logger = logging.getLogger(__name__)
 
 
-class IbanApiComClient:
+class IbanApiComClient(IbanProvider):
     """Client for IbanApi.com API - matches PHP implementation."""
 
+    source = "ibanapi_com"
+
     def __init__(self, api_key: str, timeout: int = 10):
-        self.base_url = "https://api.ibanapi.com/v1"
+        super().__init__("https://api.ibanapi.com/v1", timeout)
         self.api_key = api_key
-        self.timeout = timeout
-
-    async def validate_iban(self, iban: str) -> IbanValidationResult:
-        """Validate IBAN and get bank details using IbanApi.com API."""
+        self._validate_url = f"{self.base_url}/validate"
 
-        if not iban or not isinstance(iban, str):
-            return IbanValidationResult(
-                original_iban=str(iban),
-                is_valid=False,
-                error_message="Invalid IBAN input",
-                validation_source="ibanapi_com"
-            )
+    async def validate_iban_clean(self, clean_iban: str, original_iban: Optional[str] = None) -> IbanValidationResult:
+        """Validate an already normalized IBAN with the provider's API."""
+        iban = original_iban if original_iban is not None else clean_iban
 
-        # Clean IBAN (remove spaces)
-        clean_iban = iban.replace(" ", "").upper()
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source)
 
         try:
-            url = f"{self.base_url}/validate"
             params = {
                 "api_key": self.api_key,
                 "iban": clean_iban
             }
 
-            logger.debug(f"Making IbanApi.com request to {url}")
+            logger.debug("Making IbanApi.com request to %s", self._validate_url)
+
+            response = await self._get_client().get(self._validate_url, params=params)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
+            logger.debug("IbanApi.com response: %s", response.status_code)
 
-                logger.debug(f"IbanApi.com response: {response.status_code}")
+            if response.status_code == 429:
+                # Skip this provider for as long as it asked us to back off
+                self.breaker.hold(parse_retry_after(response.headers.get("Retry-After")))
+                return self._failure(iban, "API rate limit exceeded")
 
-                if response.status_code != 200:
-                    return IbanValidationResult(
-                        original_iban=iban,
-                        is_valid=False,
-                        error_message=f"HTTP {response.status_code}: {response.text}",
-                        validation_source="ibanapi_com"
-                    )
+            if response.status_code != 200:
+                return self._failure(iban, f"HTTP {response.status_code}: {response.text}")
 
-                data = response.json()
-                logger.debug(f"IbanApi.com response data: {data}")
-                return self._parse_ibanapi_response(iban, clean_iban, data)
+            data = orjson.loads(response.content)
+            logger.debug("IbanApi.com response data: %s", data)
+            return self._parse_ibanapi_response(iban, clean_iban, data)
 
         except httpx.TimeoutException:
-            logger.error(f"IbanApi.com API timeout for IBAN {iban}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message="API timeout",
-                validation_source="ibanapi_com"
-            )
+            logger.error("IbanApi.com API timeout for IBAN %s", iban)
+            self.breaker.record_failure()
+            return self._failure(iban, "API timeout")
+        except orjson.JSONDecodeError:
+            logger.error("IbanApi.com API returned invalid JSON for IBAN %s", iban)
+            return self._failure(iban, "Invalid JSON response")
         except Exception as e:
-            logger.error(f"IbanApi.com API error for IBAN {iban}: {str(e)}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message=f"API error: {str(e)}",
-                validation_source="ibanapi_com"
-            )
+            logger.error("IbanApi.com API error for IBAN %s: %s", iban, e)
+            self.breaker.record_failure()
+            return self._failure(iban, f"API error: {str(e)}")
 
     def _parse_ibanapi_response(
         self,
@@ -90,13 +85,7 @@ class IbanApiComClient:
             is_valid = result == 200
 
             if not is_valid:
-                return IbanValidationResult(
-                    original_iban=original_iban,
-                    formatted_iban=clean_iban,
-                    is_valid=False,
-                    error_message=message or "Invalid IBAN",
-                    validation_source="ibanapi_com"
-                )
+                return self._failure(original_iban, message or "Invalid IBAN", formatted_iban=clean_iban)
 
             # Extract data section (matches IbanDataDTO structure)
             iban_data = self._safe_get(data, "data", {})
@@ -115,7 +104,7 @@ class IbanApiComClient:
             has_bank_info = bool(bank_name and bank_name.strip()) or bool(bic and bic.strip())
 
             if not has_bank_info:
-                logger.debug(f"IbanApi.com returned valid IBAN but no bank details for {clean_iban}")
+                logger.debug("IbanApi.com returned valid IBAN but no bank details for %s", clean_iban)
                 return IbanValidationResult(
                     original_iban=original_iban,
                     formatted_iban=clean_iban,
@@ -148,14 +137,8 @@ class IbanApiComClient:
             )
 
         except Exception as e:
-            logger.error(f"Error parsing IbanApi.com response: {str(e)}")
-            return IbanValidationResult(
-                original_iban=original_iban,
-                formatted_iban=clean_iban,
-                is_valid=False,
-                error_message=f"Response parsing error: {str(e)}",
-                validation_source="ibanapi_com"
-            )
+            logger.error("Error parsing IbanApi.com response: %s", e)
+            return self._failure(original_iban, f"Response parsing error: {str(e)}", formatted_iban=clean_iban)
 
     def _safe_get(self, data: Any, key: str, default: Any = None) -> Any:
         """Safely get value from nested dict structure."""
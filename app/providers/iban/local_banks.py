@@ -0,0 +1,64 @@
+"""Offline bank lookup from bundled national bank-code tables."""
+
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+import orjson
+from .models import BankDetails
+
+logger = logging.getLogger(__name__)
+
+_BANK_CODES_DIR = Path(__file__).parent / "bank_codes"
+
+# Per-country IBAN layout: where the bank and branch codes sit, plus country metadata
+_COUNTRY_LAYOUTS = {
+    "PL": {
+        "bank_code": slice(4, 7),
+        "branch_code": slice(7, 11),
+        "country": "Poland",
+        "currency": "PLN",
+    },
+}
+
+
+def _load_bank_codes() -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Load the bank-code table of every country with a known layout."""
+    tables = {}
+    for country in _COUNTRY_LAYOUTS:
+        path = _BANK_CODES_DIR / f"{country.lower()}.json"
+        try:
+            tables[country] = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Local bank codes for %s unavailable: %s", country, e)
+    return tables
+
+
+# Bank details keyed by country code, then bank code
+LOCAL_BANK_CODES = _load_bank_codes()
+
+
+def lookup_local_bank(clean_iban: str) -> Optional[BankDetails]:
+    """Resolve bank details for a validated IBAN without a network call, if the bank is known locally."""
+    country = clean_iban[:2]
+    layout = _COUNTRY_LAYOUTS.get(country)
+    if layout is None:
+        return None
+
+    bank_code = clean_iban[layout["bank_code"]]
+    bank = LOCAL_BANK_CODES.get(country, {}).get(bank_code)
+    if bank is None:
+        return None
+
+    return BankDetails(
+        iban=clean_iban,
+        account_number=clean_iban[4:],
+        bank_name=bank["bank_name"],
+        bank_code=bank_code,
+        branch_code=clean_iban[layout["branch_code"]],
+        bic=bank["bic"],
+        bank_country=layout["country"],
+        bank_country_code=country,
+        currency=layout["currency"],
+        is_valid=True,
+        source_api="local",
+    )
@@ -2,10 +2,10 @@
 
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 
 
-@dataclass
+@dataclass(slots=True)
 class BankDetails:
     """Bank details extracted from IBAN validation."""
 
@@ -31,14 +31,31 @@ class BankDetails:
     # Additional metadata
     currency: str = ""
     source_api: str = ""
-    enriched_at: str = ""
+    enriched_at: Optional[datetime] = None  # Stamped when the details are first serialized
 
-    def __post_init__(self):
-        if not self.enriched_at:
-            self.enriched_at = datetime.now().isoformat()
+    def enriched_timestamp(self) -> str:
+        """ISO timestamp of the enrichment, stamping the current UTC time if not set yet."""
+        if self.enriched_at is None:
+            self.enriched_at = datetime.now(timezone.utc)
+        return self.enriched_at.isoformat()
 
 
-@dataclass
+# BankDetails fields exposed by IbanValidationResult.to_dict
+_BANK_DETAILS_FIELDS = (
+    "bank_name",
+    "bank_code",
+    "branch_code",
+    "bic",
+    "bank_address",
+    "bank_city",
+    "bank_country",
+    "bank_country_code",
+    "account_number",
+    "currency",
+)
+
+
+@dataclass(slots=True)
 class IbanValidationResult:
     """Result of IBAN validation with enrichment data."""
 
@@ -60,18 +77,8 @@ class IbanValidationResult:
         }
 
         if self.bank_details:
-            result["bank_details"] = {
-                "bank_name": self.bank_details.bank_name,
-                "bank_code": self.bank_details.bank_code,
-                "branch_code": self.bank_details.branch_code,
-                "bic": self.bank_details.bic,
-                "bank_address": self.bank_details.bank_address,
-                "bank_city": self.bank_details.bank_city,
-                "bank_country": self.bank_details.bank_country,
-                "bank_country_code": self.bank_details.bank_country_code,
-                "account_number": self.bank_details.account_number,
-                "currency": self.bank_details.currency,
-                "enriched_at": self.bank_details.enriched_at,
-            }
+            details = self.bank_details
+            result["bank_details"] = {f: getattr(details, f) for f in _BANK_DETAILS_FIELDS}
+            result["bank_details"]["enriched_at"] = details.enriched_timestamp()
 
         return result
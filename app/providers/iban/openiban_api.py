@@ -2,75 +2,89 @@
 
 import logging
 import httpx
-from typing import Dict, Any
+import orjson
+from dataclasses import asdict
+from typing import Dict, Any, Optional
+from app.cache.memo import cached
+from app.config import settings
+from app.providers.base import CircuitOpenError, parse_retry_after
+from .base import IbanProvider
 from .models import BankDetails, IbanValidationResult
 
 logger = logging.getLogger(__name__)
 
+# Query parameters sent with every validation request
+_VALIDATE_PARAMS = {"getBIC": "true", "validateBankCode": "true"}
 
-class OpenIBANAPI:
+
+class OpenIBANAPI(IbanProvider):
     """Client for OpenIBAN API - free IBAN validation service."""
 
-    def __init__(self, timeout: int = 10):
-        self.base_url = "https://openiban.com"
-        self.timeout = timeout
+    source = "openiban"
 
-    async def validate_iban(self, iban: str) -> IbanValidationResult:
-        """Validate IBAN and get bank details using OpenIBAN API."""
+    def __init__(self, timeout: int = 10):
+        super().__init__("https://openiban.com", timeout)
+
+    async def validate_iban_clean(self, clean_iban: str, original_iban: Optional[str] = None) -> IbanValidationResult:
+        """Validate an already normalized IBAN with the provider's API."""
+        iban = original_iban if original_iban is not None else clean_iban
+
+        async def produce() -> Dict[str, Any]:
+            return asdict(await self._validate_remote(clean_iban, iban))
+
+        # Valid results are memoized in Redis; bank details for an IBAN rarely change
+        result = await cached(
+            f"iban:openiban:{clean_iban}",
+            settings.cache_ttl_bank_accounts,
+            produce,
+            should_cache=lambda r: r["is_valid"],
+        )
+        details = result["bank_details"]
+        return IbanValidationResult(
+            **{**result, "original_iban": iban, "bank_details": BankDetails(**details) if details else None}
+        )
+
+    async def _validate_remote(self, clean_iban: str, iban: str) -> IbanValidationResult:
+        """Validate an IBAN with the OpenIBAN API."""
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source)
 
-        if not iban or not isinstance(iban, str):
-            return IbanValidationResult(
-                original_iban=str(iban),
-                is_valid=False,
-                error_message="Invalid IBAN input",
-                validation_source="openiban"
-            )
+        try:
+            path = f"/validate/{clean_iban}"
 
-        # Clean IBAN (remove spaces)
-        clean_iban = iban.replace(" ", "").upper()
+            logger.debug("Making OpenIBAN request to %s%s", self.base_url, path)
 
-        try:
-            url = f"{self.base_url}/validate/{clean_iban}"
-            params = {
-                "getBIC": "true",
-                "validateBankCode": "true"
-            }
+            response = await self._get_client().get(path, params=_VALIDATE_PARAMS)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
 
-            logger.debug(f"Making OpenIBAN request to {url}")
+            logger.debug("OpenIBAN response: %s", response.status_code)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
+            if response.status_code == 429:
+                # Skip this provider for as long as it asked us to back off
+                self.breaker.hold(parse_retry_after(response.headers.get("Retry-After")))
+                return self._failure(iban, "API rate limit exceeded")
 
-                logger.debug(f"OpenIBAN response: {response.status_code}")
-            
             if response.status_code != 200:
-                return IbanValidationResult(
-                    original_iban=iban,
-                    is_valid=False,
-                    error_message=f"HTTP {response.status_code}: {response.text}",
-                    validation_source="openiban"
-                )
+                return self._failure(iban, f"HTTP {response.status_code}: {response.text}")
 
-            data = response.json()
-            logger.debug(f"OpenIBAN response data: {data}")
+            data = orjson.loads(response.content)
+            logger.debug("OpenIBAN response data: %s", data)
             return self._parse_openiban_response(iban, clean_iban, data)
 
         except httpx.TimeoutException:
-            logger.error(f"OpenIBAN API timeout for IBAN {iban}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message="API timeout",
-                validation_source="openiban"
-            )
+            logger.error("OpenIBAN API timeout for IBAN %s", iban)
+            self.breaker.record_failure()
+            return self._failure(iban, "API timeout")
+        except orjson.JSONDecodeError:
+            logger.error("OpenIBAN API returned invalid JSON for IBAN %s", iban)
+            return self._failure(iban, "Invalid JSON response")
         except Exception as e:
-            logger.error(f"OpenIBAN API error for IBAN {iban}: {str(e)}")
-            return IbanValidationResult(
-                original_iban=iban,
-                is_valid=False,
-                error_message=f"API error: {str(e)}",
-                validation_source="openiban"
-            )
+            logger.error("OpenIBAN API error for IBAN %s: %s", iban, e)
+            self.breaker.record_failure()
+            return self._failure(iban, f"API error: {str(e)}")
 
     def _parse_openiban_response(
         self,
@@ -89,13 +103,7 @@ class OpenIBANAPI:
                 if isinstance(messages, list) and messages:
                     error_msg = messages[0] if isinstance(messages[0], str) else "Invalid IBAN"
 
-                return IbanValidationResult(
-                    original_iban=original_iban,
-                    formatted_iban=clean_iban,
-                    is_valid=False,
-                    error_message=error_msg,
-                    validation_source="openiban"
-                )
+                return self._failure(original_iban, error_msg, formatted_iban=clean_iban)
 
             # Extract bank details - handle actual OpenIBAN response structure
             bank_data = self._safe_get(data, "bankData", {})
@@ -110,7 +118,7 @@ class OpenIBANAPI:
             has_bank_info = bool(bank_name and bank_name.strip()) or bool(bank_code and bank_code.strip())
             
             if not has_bank_info:
-                logger.debug(f"OpenIBAN returned valid IBAN but no bank details for {clean_iban}")
+                logger.debug("OpenIBAN returned valid IBAN but no bank details for %s", clean_iban)
                 # Return valid IBAN but without enrichment
                 return IbanValidationResult(
                     original_iban=original_iban,
@@ -143,14 +151,8 @@ class OpenIBANAPI:
             )
 
         except Exception as e:
-            logger.error(f"Error parsing OpenIBAN response: {str(e)}")
-            return IbanValidationResult(
-                original_iban=original_iban,
-                formatted_iban=clean_iban,
-                is_valid=False,
-                error_message=f"Response parsing error: {str(e)}",
-                validation_source="openiban"
-            )
+            logger.error("Error parsing OpenIBAN response: %s", e)
+            return self._failure(original_iban, f"Response parsing error: {str(e)}", formatted_iban=clean_iban)
 
     def _safe_get(self, data: Any, key: str, default: Any = None) -> Any:
         """Safely get value from nested dict structure."""
@@ -1,5 +0,0 @@
-"""MF (Biała Lista) data provider - refactored to use modular components."""
-
-from .mf.provider import MfProvider
-
-__all__ = ["MfProvider"]
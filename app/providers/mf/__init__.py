@@ -4,7 +4,7 @@ from .http_client import MfHttpClient
 from .rate_limiter import MfRateLimiter
 from .data_parser import MfDataParser
 from .api_client import MfApiClient
-from .provider import MfProvider
+from .provider import MfProvider, mf_provider
 from .address_parser import parse_mf_address
 
 __all__ = [
@@ -13,5 +13,6 @@ __all__ = [
     "MfDataParser",
     "MfApiClient",
     "MfProvider",
+    "mf_provider",
     "parse_mf_address",
 ]
@@ -13,10 +13,25 @@ Example inputs:
 
 import logging
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Building/apartment numbers, postal codes and whitespace runs
+_RE_APARTMENT = re.compile(r'(\d+)/(\d+)')
+_RE_BUILDING_SUFFIX = re.compile(r'\s+(\d+(?:[A-Z]?))\s*$')
+_RE_BUILDING_ANY = re.compile(r'\b(\d+(?:[A-Z]?))\b')
+_RE_POSTAL = re.compile(r'(\d{2}-\d{3})')
+_RE_MULTISPACE = re.compile(r'\s+')
+
+# Common Polish street type abbreviations (ulica, aleja, plac, bulwar, osiedle, park, rondo)
+_STREET_PREFIXES = ('UL. ', 'AL. ', 'PL. ', 'BULW. ', 'OS. ', 'PARK. ', 'ROND. ')
+_STREET_PREFIX_MAX_LEN = max(map(len, _STREET_PREFIXES))
+
+# Longer inputs are parsed without memoization to keep odd values out of the cache
+_CACHEABLE_ADDRESS_LENGTH = 256
+
 
 def parse_mf_address(address: str) -> Dict[str, str]:
     """
@@ -29,17 +44,32 @@ def parse_mf_address(address: str) -> Dict[str, str]:
         Dict with parsed address components
     """
     if not address or not isinstance(address, str):
-        logger.warning(f"Invalid address input: {address}")
+        logger.warning("Invalid address input: %s", address)
         return _create_empty_address()
 
     address = address.strip()
     if not address:
         return _create_empty_address()
 
+    if len(address) > _CACHEABLE_ADDRESS_LENGTH:
+        return _parse_address(address)
+
+    # Cached results are tuples so callers always get a fresh dict they may mutate
+    return dict(_parse_address_cached(address))
+
+
+@lru_cache(maxsize=16384)
+def _parse_address_cached(address: str) -> Tuple[Tuple[str, str], ...]:
+    """Parse a stripped address string, memoized by the exact input."""
+    return tuple(_parse_address(address).items())
+
+
+def _parse_address(address: str) -> Dict[str, str]:
+    """Parse a stripped address string, falling back to the raw value on errors."""
     try:
         return _parse_address_components(address)
     except Exception as e:
-        logger.error(f"Error parsing address '{address}': {str(e)}")
+        logger.error("Error parsing address '%s': %s", address, e)
         return _create_fallback_address(address)
 
 
@@ -50,13 +80,13 @@ def _parse_address_components(address: str) -> Dict[str, str]:
     parts = [part.strip() for part in address.split(',')]
 
     if len(parts) != 2:
-        logger.debug(f"Unexpected address format (no comma or multiple commas): {address}")
+        logger.debug("Unexpected address format (no comma or multiple commas): %s", address)
         return _create_fallback_address(address)
 
     street_part, city_part = parts
 
     if not street_part or not city_part:
-        logger.debug(f"Empty street or city part: {address}")
+        logger.debug("Empty street or city part: %s", address)
         return _create_fallback_address(address)
 
     # Parse street component
@@ -82,7 +112,7 @@ def _parse_street_component(street_part: str) -> Dict[str, str]:
     # Pattern: street name + number + optional apartment number
 
     # Look for patterns like "15/3" (building/apartment)
-    apartment_match = re.search(r'(\d+)/(\d+)', street_part)
+    apartment_match = _RE_APARTMENT.search(street_part)
     if apartment_match:
         building_num = apartment_match.group(1)
         apartment_num = apartment_match.group(2)
@@ -95,7 +125,7 @@ def _parse_street_component(street_part: str) -> Dict[str, str]:
         }
 
     # Look for simple building number pattern at the end
-    building_match = re.search(r'\s+(\d+(?:[A-Z]?))\s*$', street_part)
+    building_match = _RE_BUILDING_SUFFIX.search(street_part)
     if building_match:
         building_num = building_match.group(1)
         street_name = street_part[:building_match.start()].strip()
@@ -106,13 +136,13 @@ def _parse_street_component(street_part: str) -> Dict[str, str]:
         }
 
     # Look for number anywhere in the string (fallback)
-    number_match = re.search(r'\b(\d+(?:[A-Z]?))\b', street_part)
+    number_match = _RE_BUILDING_ANY.search(street_part)
     if number_match:
         building_num = number_match.group(1)
         # Remove the number to get street name
         street_name = street_part.replace(building_num, '').strip()
         # Clean up any double spaces
-        street_name = re.sub(r'\s+', ' ', street_name)
+        street_name = _RE_MULTISPACE.sub(' ', street_name)
         return {
             "street": street_name,
             "building_number": building_num,
@@ -120,7 +150,7 @@ def _parse_street_component(street_part: str) -> Dict[str, str]:
         }
 
     # If no number pattern found, treat whole thing as street name
-    logger.debug(f"No building number found in street: {street_part}")
+    logger.debug("No building number found in street: %s", street_part)
     return {
         "street": street_part.strip(),
         "building_number": "",
@@ -132,7 +162,7 @@ def _parse_city_component(city_part: str) -> Dict[str, str]:
     """Parse city name and postal code."""
 
     # Look for postal code pattern (XX-XXX)
-    postal_match = re.search(r'(\d{2}-\d{3})', city_part)
+    postal_match = _RE_POSTAL.search(city_part)
     if postal_match:
         postal_code = postal_match.group(1)
         # Remove postal code to get city name
@@ -143,7 +173,7 @@ def _parse_city_component(city_part: str) -> Dict[str, str]:
         }
 
     # If no postal code found, treat whole thing as city
-    logger.debug(f"No postal code found in city part: {city_part}")
+    logger.debug("No postal code found in city part: %s", city_part)
     return {
         "city": city_part.strip(),
         "postal_code": ""
@@ -153,22 +183,9 @@ def _parse_city_component(city_part: str) -> Dict[str, str]:
 def _normalize_street_prefix(street_part: str) -> str:
     """Normalize common Polish street prefixes."""
 
-    # Common Polish street type abbreviations
-    prefixes = [
-        ('UL.', 'ULICA'),
-        ('AL.', 'ALEJA'),
-        ('PL.', 'PLAC'),
-        ('BULW.', 'BULWAR'),
-        ('OS.', 'OSIEDLE'),
-        ('PARK.', 'PARK'),
-        ('ROND.', 'RONDO'),
-    ]
-
-    street_upper = street_part.upper()
-    for abbrev, full in prefixes:
-        if street_upper.startswith(abbrev + ' '):
-            # Remove the prefix for easier parsing
-            return street_part[len(abbrev):].strip()
+    if street_part[:_STREET_PREFIX_MAX_LEN].upper().startswith(_STREET_PREFIXES):
+        # Remove the prefix for easier parsing
+        return street_part.split(' ', 1)[1].strip()
 
     return street_part
 
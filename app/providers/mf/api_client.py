@@ -3,12 +3,21 @@
 import logging
 from typing import Dict, Any
 from datetime import datetime, timezone
+from app.providers.base import DEFAULT_RETRY_AFTER_SECONDS
 from .http_client import MfHttpClient
 from .data_parser import MfDataParser
 
 logger = logging.getLogger(__name__)
 
 
+class MfRateLimitExceeded(RuntimeError):
+    """Raised when the MF API answers 429, carrying its Retry-After delay in seconds."""
+
+    def __init__(self, retry_after: float = DEFAULT_RETRY_AFTER_SECONDS):
+        self.retry_after = retry_after
+        super().__init__("Rate limit exceeded")
+
+
 class MfApiClient:
     """Client for MF API operations."""
 
@@ -19,35 +28,27 @@ class MfApiClient:
     async def search_company(self, nip: str, date: str = None) -> Dict[str, Any]:
         """Search for company by NIP in MF whitelist."""
         if not date:
-            date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            date = datetime.now(timezone.utc).date().isoformat()
 
         try:
             response = await self.http_client.search_by_nip(nip, date)
 
             if not response["found"]:
                 if response.get("status_code") == 404:
-                    return {
-                        "found": False,
-                        "nip": nip,
-                        "date": date,
-                        "message": "Company not found in MF whitelist",
-                        "fetched_at": datetime.now(timezone.utc).isoformat()
-                    }
+                    return self.data_parser.create_not_found_response(
+                        nip, date, "Company not found in MF whitelist"
+                    )
                 elif response.get("status_code") == 429:
                     # Let the rate limiter handle this
-                    raise RuntimeError("Rate limit exceeded")
+                    raise MfRateLimitExceeded(response.get("retry_after", DEFAULT_RETRY_AFTER_SECONDS))
                 else:
-                    return {
-                        "found": False,
-                        "nip": nip,
-                        "date": date,
-                        "message": response.get("message", "Unknown error from MF API"),
-                        "fetched_at": datetime.now(timezone.utc).isoformat()
-                    }
+                    return self.data_parser.create_not_found_response(
+                        nip, date, response.get("message", "Unknown error from MF API")
+                    )
 
             # Parse successful response
             return await self.data_parser.parse_response(response["data"], nip, date)
 
         except Exception as e:
-            logger.error(f"MF API client error for NIP {nip}: {str(e)}")
+            logger.error("MF API client error for NIP %s: %s", nip, e)
             raise
@@ -20,14 +20,14 @@ class MfDataParser:
 
         # Validate basic response structure
         if not validate_mf_response_structure(data):
-            return self._create_not_found_response(nip, date, "Invalid response format from MF API")
+            return self.create_not_found_response(nip, date, "Invalid response format from MF API")
 
         result = data["result"]
 
         # Handle case where no subject data found
         if not result or "subject" not in result:
-            logger.info(f"MF API result structure: {result}")
-            return self._create_not_found_response(nip, date, "No subject data found in MF response")
+            logger.info("MF API result structure: %s", result)
+            return self.create_not_found_response(nip, date, "No subject data found in MF response")
 
         subject = result["subject"]
 
@@ -49,10 +49,10 @@ class MfDataParser:
             }
 
         except Exception as e:
-            logger.error(f"Error parsing MF response for NIP {nip}: {str(e)}", exc_info=True)
-            return self._create_not_found_response(nip, date, f"Error parsing MF response: {str(e)}")
+            logger.error("Error parsing MF response for NIP %s: %s", nip, e, exc_info=True)
+            return self.create_not_found_response(nip, date, f"Error parsing MF response: {str(e)}")
 
-    def _create_not_found_response(self, nip: str, date: str, message: str) -> Dict[str, Any]:
+    def create_not_found_response(self, nip: str, date: str, message: str) -> Dict[str, Any]:
         """Create a standardized not found response."""
         return {
             "found": False,
@@ -1,8 +1,10 @@
 """HTTP client for MF API operations."""
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
+import orjson
+from app.providers.base import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,27 @@ class MfHttpClient:
     def __init__(self, api_url: str = "https://wl-api.mf.gov.pl", timeout: int = 10):
         self.api_url = api_url.rstrip("/")
         self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def search_by_nip(self, nip: str, date: str) -> Dict[str, Any]:
         """Search company by NIP in MF whitelist."""
@@ -22,42 +45,43 @@ class MfHttpClient:
         url = f"{self.api_url}/api/search/nip/{clean_nip}"
         params = {"date": date}
 
-        logger.debug(f"Making MF API request to {url} with params {params}")
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params)
-
-            logger.debug(f"MF API response: {response.status_code}")
-            logger.debug(f"MF API response content: {response.text[:500]}...")
-
-            if response.status_code == 404:
-                return {
-                    "found": False,
-                    "status_code": 404,
-                    "message": "Company not found in MF whitelist"
-                }
-
-            if response.status_code == 429:
-                return {
-                    "found": False,
-                    "status_code": 429,
-                    "message": "Rate limit exceeded"
-                }
-
-            response.raise_for_status()
-
-            try:
-                data = response.json()
-                return {
-                    "found": True,
-                    "status_code": 200,
-                    "data": data
-                }
-            except Exception as e:
-                logger.error(f"Failed to parse MF API response as JSON: {response.text}")
-                return {
-                    "found": False,
-                    "status_code": 200,
-                    "message": f"Invalid JSON response from MF API: {str(e)}",
-                    "raw_response": response.text
-                }
+        logger.debug("Making MF API request to %s with params %s", url, params)
+
+        response = await self._get_client().get(url, params=params)
+
+        logger.debug("MF API response: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("MF API response content: %s...", response.text[:500])
+
+        if response.status_code == 404:
+            return {
+                "found": False,
+                "status_code": 404,
+                "message": "Company not found in MF whitelist"
+            }
+
+        if response.status_code == 429:
+            return {
+                "found": False,
+                "status_code": 429,
+                "message": "Rate limit exceeded",
+                "retry_after": parse_retry_after(response.headers.get("Retry-After")),
+            }
+
+        response.raise_for_status()
+
+        try:
+            data = orjson.loads(response.content)
+            return {
+                "found": True,
+                "status_code": 200,
+                "data": data
+            }
+        except Exception as e:
+            logger.error("Failed to parse MF API response as JSON: %s", response.text)
+            return {
+                "found": False,
+                "status_code": 200,
+                "message": f"Invalid JSON response from MF API: {str(e)}",
+                "raw_response": response.text
+            }
@@ -1,20 +1,29 @@
 """Main MF provider class that orchestrates all components."""
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Union
+from datetime import datetime, timedelta, timezone
 import httpx
 
-from app.providers.base import BaseProvider, ProviderError, RateLimitError, ValidationError
+from app.cache.memo import cached
+from app.config import settings
+from app.providers.base import BaseProvider, ProviderError, RateLimitError, ValidationError, parse_retry_after
 from app.utils.validators import validate_nip
 
 from .http_client import MfHttpClient
 from .rate_limiter import MfRateLimiter
 from .data_parser import MfDataParser
-from .api_client import MfApiClient
+from .api_client import MfApiClient, MfRateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
+# Longest a request queues for an MF rate-limit slot before failing with RateLimitError
+MAX_RATE_LIMIT_WAIT_SECONDS = 5.0
+
+# Maximum number of concurrent lookups in fetch_many
+MF_BATCH_CONCURRENCY = 8
+
 
 class MfProvider(BaseProvider):
     """Provider for MF (Biała Lista) - Polish VAT whitelist using refactored components."""
@@ -43,34 +52,75 @@ class MfProvider(BaseProvider):
         """Get next available time for requests."""
         return self.rate_limiter.get_next_available_time()
 
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.http_client.aclose()
+
     async def fetch_data(self, nip: str, **kwargs) -> Dict[str, Any]:
         """
         Fetch company data from MF API.
 
         Args:
             nip: Company NIP number
-            **kwargs: Additional parameters (date for historical data)
+            **kwargs: Additional parameters (date for historical data, refresh to bypass the response cache)
 
         Returns:
             Dict containing MF data
         """
         if not self.validate_identifier(nip):
-            logger.error(f"Invalid NIP: {nip}")
+            logger.error("Invalid NIP: %s", nip)
             raise ValidationError(f"Invalid NIP: {nip}", self.name)
 
-        if self.is_rate_limited():
-            logger.error(f"Rate limit exceeded for NIP: {nip}")
-            raise RateLimitError(self.name, self.get_next_available_time())
-
         # Get date parameter (format: YYYY-MM-DD)
         date_param = kwargs.get("date")
         if not date_param:
-            date_param = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            date_param = datetime.now(timezone.utc).date().isoformat()
+
+        # Repeat lookups for the same (NIP, date) are served from Redis without touching the rate limit
+        return await cached(
+            f"mf:response:{nip}:{date_param}",
+            settings.cache_ttl_mf_response,
+            lambda: self._fetch_uncached(nip, date_param),
+            should_cache=lambda result: bool(result.get("found")),
+            refresh=kwargs.get("refresh", False),
+        )
 
-        try:
-            # Record request for rate limiting
-            self.rate_limiter.record_request()
+    async def fetch_many(
+        self, nips: list, concurrency: int = MF_BATCH_CONCURRENCY, **kwargs
+    ) -> Dict[str, Union[Dict[str, Any], ProviderError]]:
+        """
+        Fetch company data for multiple NIPs concurrently.
+
+        Args:
+            nips: List of NIP numbers
+            concurrency: Maximum number of lookups in flight at once
+            **kwargs: Passed to fetch_data for every NIP
+
+        Returns:
+            Dict mapping each NIP to its MF data, or to the ProviderError it failed with
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(nip: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.fetch_data(nip, **kwargs)
+
+        # Lookups still queue on the shared rate limiter; concurrency overlaps cache hits and network I/O
+        unique = list(dict.fromkeys(nips))
+        results = await asyncio.gather(*(fetch(nip) for nip in unique), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, ProviderError):
+                raise result
+        return dict(zip(unique, results))
+
+    async def _fetch_uncached(self, nip: str, date_param: str) -> Dict[str, Any]:
+        """Fetch company data from the MF API, waiting for a rate-limit slot."""
+        # Queue behind earlier requests instead of failing, unless the wait would be too long
+        if not await self.rate_limiter.acquire(MAX_RATE_LIMIT_WAIT_SECONDS):
+            logger.error("Rate limit exceeded for NIP: %s", nip)
+            raise RateLimitError(self.name, self.get_next_available_time())
 
+        try:
             # Fetch data using API client
             result = await self.api_client.search_company(nip, date_param)
             return result
@@ -79,12 +129,21 @@ class MfProvider(BaseProvider):
             raise ProviderError(f"MF API timeout for NIP {nip}", self.name, 408)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
-                raise RateLimitError(self.name)
+                raise self._rate_limited(parse_retry_after(e.response.headers.get("Retry-After")))
             raise ProviderError(f"MF API error: {e.response.status_code}", self.name, e.response.status_code)
+        except MfRateLimitExceeded as e:
+            raise self._rate_limited(e.retry_after)
         except RuntimeError as e:
-            if "Rate limit exceeded" in str(e):
-                raise RateLimitError(self.name)
             raise ProviderError(f"MF API error: {str(e)}", self.name)
         except Exception as e:
-            logger.error(f"MF API error for NIP {nip}: {str(e)}")
+            logger.error("MF API error for NIP %s: %s", nip, e)
             raise ProviderError(f"MF API error: {str(e)}", self.name)
+
+    def _rate_limited(self, retry_after: float) -> RateLimitError:
+        """Hold the limiter off for the delay the API asked for and build the matching error."""
+        self.rate_limiter.back_off(retry_after)
+        return RateLimitError(self.name, datetime.now(timezone.utc) + timedelta(seconds=retry_after))
+
+
+# Global provider instance
+mf_provider = MfProvider()
@@ -1,42 +1,52 @@
 """Rate limiter for MF API."""
 
+import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
+from app.providers.token_bucket import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
 class MfRateLimiter:
-    """Rate limiter for MF API with simple time-based limiting."""
+    """Rate limiter for MF API backed by a token bucket."""
 
     def __init__(self, requests_per_second: float = 1.0):
-        self.rate_limit_window = timedelta(seconds=1.0 / requests_per_second)
+        self.bucket = TokenBucket(capacity=1, rate=requests_per_second)
         self.last_request_time: Optional[datetime] = None
 
     def is_rate_limited(self) -> bool:
         """Check if we're currently rate limited."""
-        if not self.last_request_time:
-            return False
-        return datetime.now(timezone.utc) - self.last_request_time < self.rate_limit_window
+        return self.bucket.wait_time() > 0
 
     def get_next_available_time(self) -> Optional[datetime]:
         """Get next available time for requests."""
-        if not self.is_rate_limited():
+        wait = self.bucket.wait_time()
+        if wait == 0.0:
             return None
-        return self.last_request_time + self.rate_limit_window if self.last_request_time else None
+        return datetime.now(timezone.utc) + timedelta(seconds=wait)
 
     def record_request(self):
         """Record a request for rate limiting purposes."""
+        self.bucket.try_take()
         self.last_request_time = datetime.now(timezone.utc)
 
-    def get_wait_time(self) -> float:
-        """Get the time to wait before the next request (in seconds)."""
-        if not self.is_rate_limited():
-            return 0.0
+    async def acquire(self, max_wait: float) -> bool:
+        """Wait for a request slot; return False without waiting if the slot is more than max_wait away."""
+        wait = self.bucket.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self.last_request_time = datetime.now(timezone.utc)
+        return True
 
-        if self.last_request_time:
-            elapsed = (datetime.now(timezone.utc) - self.last_request_time).total_seconds()
-            return max(0.0, self.rate_limit_window.total_seconds() - elapsed)
+    def back_off(self, seconds: float = 1.0) -> None:
+        """Hold off further requests after the API itself reported a rate limit."""
+        self.bucket.drain(seconds)
 
-        return 0.0
+    def get_wait_time(self) -> float:
+        """Get the time to wait before the next request (in seconds)."""
+        return self.bucket.wait_time()
@@ -2,14 +2,44 @@
 
 import logging
 from typing import Dict, Any, List, Optional
+from app.utils.validators import normalize_iban
 
 logger = logging.getLogger(__name__)
 
+# (output key, MF API key) pairs for the string fields of a subject, address and person
+_SUBJECT_FIELDS = (
+    ("name", "name"),
+    ("regon", "regon"),
+    ("krs", "krs"),
+    ("status_vat", "statusVat"),
+    ("registration_legal_date", "registrationLegalDate"),
+    ("registration_denial_basis", "registrationDenialBasis"),
+    ("registration_denial_date", "registrationDenialDate"),
+    ("restoration_basis", "restorationBasis"),
+    ("restoration_date", "restorationDate"),
+    ("removal_basis", "removalBasis"),
+    ("removal_date", "removalDate"),
+)
+_ADDRESS_FIELDS = (
+    ("street", "street"),
+    ("building_number", "buildingNumber"),
+    ("apartment_number", "apartmentNumber"),
+    ("city", "city"),
+    ("postal_code", "postalCode"),
+)
+_PERSON_FIELDS = (
+    ("company_name", "companyName"),
+    ("first_name", "firstName"),
+    ("last_name", "lastName"),
+    ("nip", "nip"),
+    ("pesel", "pesel"),
+)
+
 
 def safe_get(data: Any, key: str, default: Any = "", expected_type: type = str) -> Any:
     """Safely get a value from a dict-like object with type checking."""
     if not isinstance(data, dict):
-        logger.warning(f"Expected dict for key '{key}', got {type(data)}")
+        logger.warning("Expected dict for key '%s', got %s", key, type(data))
         return default
 
     value = data.get(key, default)
@@ -18,7 +48,7 @@ def safe_get(data: Any, key: str, default: Any = "", expected_type: type = str)
         return default
 
     if not isinstance(value, expected_type):
-        logger.debug(f"Key '{key}' expected {expected_type.__name__}, got {type(value).__name__}: {value}")
+        logger.debug("Key '%s' expected %s, got %s: %s", key, expected_type.__name__, type(value).__name__, value)
         # Try to convert if possible
         if expected_type == str:
             return str(value) if value is not None else default
@@ -44,26 +74,21 @@ def safe_parse_address(addr_data: Any) -> Optional[Dict[str, str]]:
 
     if isinstance(addr_data, str):
         # Handle string addresses by attempting to parse
-        logger.debug(f"Address is string format: {addr_data}")
+        logger.debug("Address is string format: %s", addr_data)
         try:
             from .address_parser import parse_mf_address
             return parse_mf_address(addr_data)
         except Exception as e:
-            logger.warning(f"Failed to parse string address '{addr_data}': {str(e)}")
+            logger.warning("Failed to parse string address '%s': %s", addr_data, e)
             return {"raw_address": addr_data}
 
     if not isinstance(addr_data, dict):
-        logger.warning(f"Address data is neither string nor dict: {type(addr_data)}")
+        logger.warning("Address data is neither string nor dict: %s", type(addr_data))
         return None
 
-    return {
-        "street": safe_get(addr_data, "street"),
-        "building_number": safe_get(addr_data, "buildingNumber"),
-        "apartment_number": safe_get(addr_data, "apartmentNumber"),
-        "city": safe_get(addr_data, "city"),
-        "postal_code": safe_get(addr_data, "postalCode"),
-        "country": safe_get(addr_data, "country", "Polska")
-    }
+    address = {key: safe_get(addr_data, source) for key, source in _ADDRESS_FIELDS}
+    address["country"] = safe_get(addr_data, "country", "Polska")
+    return address
 
 
 async def safe_parse_bank_accounts(accounts: Any, date: str, enable_enrichment: bool = True, country_code: str = 'PL') -> List[Dict[str, Any]]:
@@ -72,7 +97,7 @@ async def safe_parse_bank_accounts(accounts: Any, date: str, enable_enrichment:
         return []
 
     if not isinstance(accounts, list):
-        logger.warning(f"Bank accounts expected list, got {type(accounts)}: {accounts}")
+        logger.warning("Bank accounts expected list, got %s: %s", type(accounts), accounts)
         # Try to convert single string to list
         if isinstance(accounts, str):
             accounts = [accounts]
@@ -82,28 +107,19 @@ async def safe_parse_bank_accounts(accounts: Any, date: str, enable_enrichment:
     result = []
     enrichment_client = None
 
-    # Initialize IBAN enrichment client if enabled
+    # Use the shared IBAN enrichment client if enabled
     if enable_enrichment:
         try:
-            from app.providers.iban import IbanEnrichmentClient
-            from app.config import settings
-
-            # Try to get IbanApi.com key from settings
-            ibanapi_key = getattr(settings, 'ibanapi_com_key', None)
-            apilayer_key = getattr(settings, 'apilayer_api_key', None)
-
-            enrichment_client = IbanEnrichmentClient(
-                ibanapi_com_key=ibanapi_key,
-                apilayer_api_key=apilayer_key
-            )
-            logger.debug(f"IBAN enrichment client initialized with IbanApi.com: {bool(ibanapi_key)}, APILayer: {bool(apilayer_key)}")
+            from app.providers.iban import iban_enrichment_client
+
+            enrichment_client = iban_enrichment_client
         except Exception as e:
-            logger.warning(f"IBAN enrichment unavailable: {str(e)}")
+            logger.warning("IBAN enrichment unavailable: %s", e)
             enable_enrichment = False
 
     for account in accounts:
         if not isinstance(account, str) or not account.strip():
-            logger.debug(f"Skipping invalid bank account: {account}")
+            logger.debug("Skipping invalid bank account: %s", account)
             continue
 
         clean_account = format_bank_account_as_iban(account=account, country_code=country_code)
@@ -128,7 +144,7 @@ async def safe_parse_bank_accounts(accounts: Any, date: str, enable_enrichment:
                     "enrichment_available": enrichment.get("enrichment_available", False)
                 })
             except Exception as e:
-                logger.warning(f"Failed to enrich account {clean_account}: {str(e)}")
+                logger.warning("Failed to enrich account %s: %s", clean_account, e)
                 account_info.update({
                     "enrichment_available": False,
                     "enrichment_error": str(e)
@@ -147,28 +163,22 @@ def safe_parse_person_list(persons: Any, list_type: str) -> List[Dict[str, str]]
         return []
 
     if not isinstance(persons, list):
-        logger.warning(f"{list_type} expected list, got {type(persons)}: {persons}")
+        logger.warning("%s expected list, got %s: %s", list_type, type(persons), persons)
         return []
 
     result = []
     for person in persons:
         if not isinstance(person, dict):
-            logger.debug(f"Skipping invalid {list_type} entry: {person}")
+            logger.debug("Skipping invalid %s entry: %s", list_type, person)
             continue
 
-        parsed_person = {
-            "company_name": safe_get(person, "companyName"),
-            "first_name": safe_get(person, "firstName"),
-            "last_name": safe_get(person, "lastName"),
-            "nip": safe_get(person, "nip"),
-            "pesel": safe_get(person, "pesel")
-        }
+        parsed_person = {key: safe_get(person, source) for key, source in _PERSON_FIELDS}
 
         # Only add if at least one field has meaningful data
         if any(value.strip() for value in parsed_person.values() if isinstance(value, str)):
             result.append(parsed_person)
         else:
-            logger.debug(f"Skipping empty {list_type} entry")
+            logger.debug("Skipping empty %s entry", list_type)
 
     return result
 
@@ -176,24 +186,12 @@ def safe_parse_person_list(persons: Any, list_type: str) -> List[Dict[str, str]]
 def safe_parse_mf_subject(subject: Any) -> Dict[str, Any]:
     """Safely parse MF subject data with comprehensive error handling."""
     if not isinstance(subject, dict):
-        logger.error(f"Subject data is not a dict: {type(subject)}")
+        logger.error("Subject data is not a dict: %s", type(subject))
         raise ValueError(f"Invalid subject data type: {type(subject)}")
 
     # Basic fields with safe extraction
-    basic_data = {
-        "name": safe_get(subject, "name"),
-        "regon": safe_get(subject, "regon"),
-        "krs": safe_get(subject, "krs"),
-        "status_vat": safe_get(subject, "statusVat"),
-        "registration_legal_date": safe_get(subject, "registrationLegalDate"),
-        "registration_denial_basis": safe_get(subject, "registrationDenialBasis"),
-        "registration_denial_date": safe_get(subject, "registrationDenialDate"),
-        "restoration_basis": safe_get(subject, "restorationBasis"),
-        "restoration_date": safe_get(subject, "restorationDate"),
-        "removal_basis": safe_get(subject, "removalBasis"),
-        "removal_date": safe_get(subject, "removalDate"),
-        "has_virtual_accounts": safe_get(subject, "hasVirtualAccounts", False, bool),
-    }
+    basic_data = {key: safe_get(subject, source) for key, source in _SUBJECT_FIELDS}
+    basic_data["has_virtual_accounts"] = safe_get(subject, "hasVirtualAccounts", False, bool)
 
     # Complex fields with custom parsing
     complex_data = {
@@ -212,7 +210,7 @@ def validate_mf_response_structure(data: Dict[str, Any]) -> bool:
     """Validate that MF response has the expected structure."""
     try:
         if not isinstance(data, dict):
-            logger.error(f"MF response is not a dict: {type(data)}")
+            logger.error("MF response is not a dict: %s", type(data))
             return False
 
         if "result" not in data:
@@ -221,7 +219,7 @@ def validate_mf_response_structure(data: Dict[str, Any]) -> bool:
 
         result = data["result"]
         if not isinstance(result, dict):
-            logger.error(f"MF result is not a dict: {type(result)}")
+            logger.error("MF result is not a dict: %s", type(result))
             return False
 
         # Check for either subject or subjects field
@@ -234,13 +232,13 @@ def validate_mf_response_structure(data: Dict[str, Any]) -> bool:
         return True
 
     except Exception as e:
-        logger.error(f"Error validating MF response structure: {str(e)}")
+        logger.error("Error validating MF response structure: %s", e)
         return False
 
 
 def format_bank_account_as_iban(account: str, country_code: str = 'PL') -> str:
     """Format bank account as IBAN."""
-    account = account.replace(" ", "").upper().strip()
+    account = normalize_iban(account).strip()
 
     if account.startswith(country_code):
         return account
@@ -1,5 +0,0 @@
-"""REGON API provider - refactored to use modular components."""
-
-from .regon.provider import RegonProvider
-
-__all__ = ["RegonProvider"]
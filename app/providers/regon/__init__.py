@@ -6,7 +6,7 @@ from .session_manager import RegonSessionManager
 from .rate_limiter import RegonRateLimiter
 from .data_mapper import RegonDataMapper
 from .api_client import RegonApiClient
-from .provider import RegonProvider
+from .provider import RegonProvider, regon_provider
 
 __all__ = [
     "EntityType",
@@ -17,4 +17,5 @@ __all__ = [
     "RegonDataMapper",
     "RegonApiClient",
     "RegonProvider",
+    "regon_provider",
 ]
@@ -33,7 +33,7 @@ class RegonApiClient:
             return self._parse_search_response(response_text)
             
         except Exception as e:
-            logger.error(f"Search request failed: {str(e)}")
+            logger.error("Search request failed: %s", e)
             raise
             
     async def get_detailed_report(self, regon: str, entity_type: EntityType) -> Dict[str, Any]:
@@ -53,7 +53,7 @@ class RegonApiClient:
             return self._parse_report_response(response_text, report_name.value)
             
         except Exception as e:
-            logger.error(f"Detailed report request failed: {str(e)}")
+            logger.error("Detailed report request failed: %s", e)
             raise
             
     def _build_search_soap_body(self, nip: str) -> str:
@@ -56,6 +56,10 @@ class RegonProvider(BaseProvider):
         """Get next available time for requests."""
         return self.rate_limiter.get_next_available_time()
 
+    async def aclose(self) -> None:
+        """Close the underlying SOAP client."""
+        await self.soap_client.aclose()
+
     async def fetch_data(self, nip: str, **kwargs) -> Dict[str, Any]:
         """
         Fetch company data from REGON API.
@@ -64,14 +68,14 @@ class RegonProvider(BaseProvider):
         1. Search by NIP to get basic info and determine entity type
         2. Get detailed report based on entity type
         """
-        logger.info(f"Fetching data for NIP: {nip}")
+        logger.info("Fetching data for NIP: %s", nip)
 
         if not self.validate_identifier(nip):
-            logger.error(f"Invalid NIP format: {nip}")
+            logger.error("Invalid NIP format: %s", nip)
             raise ValidationError(f"Invalid NIP format: {nip}", self.name)
 
         if self.is_rate_limited():
-            logger.warning(f"Rate limited for NIP: {nip}")
+            logger.warning("Rate limited for NIP: %s", nip)
             raise RateLimitError(self.name, self.get_next_available_time())
 
         try:
@@ -107,7 +111,7 @@ class RegonProvider(BaseProvider):
                     basic_info["report_type"] = detailed_data.get("report_type", "")
                 except Exception as e:
                     # If detailed report fails, still return basic info
-                    logger.warning(f"Failed to get detailed report for {regon}: {str(e)}")
+                    logger.warning("Failed to get detailed report for %s: %s", regon, e)
                     basic_info["detailed_error"] = str(e)
 
             return basic_info
@@ -116,5 +120,9 @@ class RegonProvider(BaseProvider):
             # Re-raise these specific errors as-is
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching data for NIP {nip}: {str(e)}")
+            logger.error("Unexpected error fetching data for NIP %s: %s", nip, e)
             raise ProviderError(f"Unexpected error: {str(e)}", self.name)
+
+
+# Global provider instance
+regon_provider = RegonProvider()
@@ -4,11 +4,13 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
+from app.providers.token_bucket import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
 class RegonRateLimiter:
-    """Rate limiter for REGON API with time-based limits."""
+    """Rate limiter for REGON API backed by a token bucket with time-of-day limits."""
 
     # Rate limiting configuration based on REGON API limits
     RATE_LIMITS = {
@@ -26,6 +28,8 @@ class RegonRateLimiter:
     }
 
     def __init__(self):
+        per_second = self.get_current_rate_limits()["per_second"]
+        self.bucket = TokenBucket(capacity=per_second, rate=per_second)
         self.last_request_time: Optional[datetime] = None
         self.request_count = 0
 
@@ -41,49 +45,30 @@ class RegonRateLimiter:
         else:
             return self.RATE_LIMITS["off_peak_2"]
 
+    def _sync_bucket(self) -> TokenBucket:
+        """Apply the current time-of-day limit to the bucket."""
+        per_second = self.get_current_rate_limits()["per_second"]
+        self.bucket.capacity = per_second
+        self.bucket.rate = per_second
+        return self.bucket
+
     def is_rate_limited(self) -> bool:
         """Check if we're currently rate limited."""
-        if not self.last_request_time:
-            return False
-
-        now = datetime.now()
-        time_since_last = now - self.last_request_time
-
-        # Get current rate limits based on time of day
-        current_limits = self.get_current_rate_limits()
-
-        # Check if we need to wait (simplified check for per-second limit)
-        min_interval = 1 / current_limits["per_second"]
-        return time_since_last.total_seconds() < min_interval
+        return self._sync_bucket().wait_time() > 0
 
     def get_next_available_time(self) -> Optional[datetime]:
         """Get next available time for requests."""
-        if not self.is_rate_limited():
+        wait = self._sync_bucket().wait_time()
+        if wait == 0.0:
             return None
-
-        current_limits = self.get_current_rate_limits()
-        wait_time = 1 / current_limits["per_second"]
-
-        if self.last_request_time:
-            return self.last_request_time + timedelta(seconds=wait_time)
-
-        return None
+        return datetime.now() + timedelta(seconds=wait)
 
     def record_request(self):
         """Record a request for rate limiting purposes."""
+        self._sync_bucket().try_take()
         self.last_request_time = datetime.now()
         self.request_count += 1
 
     def get_wait_time(self) -> float:
         """Get the time to wait before the next request (in seconds)."""
-        if not self.is_rate_limited():
-            return 0.0
-
-        current_limits = self.get_current_rate_limits()
-        min_interval = 1 / current_limits["per_second"]
-
-        if self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time).total_seconds()
-            return max(0.0, min_interval - elapsed)
-
-        return 0.0
+        return self._sync_bucket().wait_time()
@@ -2,9 +2,12 @@
 
 import logging
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional, Union
+from typing import TYPE_CHECKING, Dict, Any
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from .data_mapper import EntityType
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +22,7 @@ def safe_get_xml_text(element: ET.Element, default: str = "") -> str:
 def safe_get_dict_value(data: Any, key: str, default: str = "") -> str:
     """Safely get a value from a dict-like object."""
     if not isinstance(data, dict):
-        logger.warning(f"Expected dict for key '{key}', got {type(data)}")
+        logger.warning("Expected dict for key '%s', got %s", key, type(data))
         return default
         
     value = data.get(key, default)
@@ -59,10 +62,10 @@ def safe_parse_regon_search_xml(xml_data: str) -> Dict[str, Any]:
         return {"found": True, "data": company_data}
         
     except ET.ParseError as e:
-        logger.error(f"Failed to parse REGON search XML: {str(e)}")
+        logger.error("Failed to parse REGON search XML: %s", e)
         return {"found": True, "raw_data": xml_data}
     except Exception as e:
-        logger.error(f"Unexpected error parsing REGON search XML: {str(e)}")
+        logger.error("Unexpected error parsing REGON search XML: %s", e)
         return {"found": False, "message": f"XML parsing error: {str(e)}"}
 
 
@@ -81,7 +84,7 @@ def safe_build_regon_company_info(nip: str, search_result: Dict[str, Any]) -> Di
     
     # Safely extract data with type checking
     if not isinstance(company_data, dict):
-        logger.error(f"Company data is not a dict: {type(company_data)}")
+        logger.error("Company data is not a dict: %s", type(company_data))
         return {
             "found": False,
             "nip": nip,
@@ -95,7 +98,6 @@ def safe_build_regon_company_info(nip: str, search_result: Dict[str, Any]) -> Di
     name = safe_get_dict_value(company_data, "Nazwa")
     
     # Map entity type safely
-    from .data_mapper import EntityType
     entity_type = map_regon_type_safely(typ)
     
     return {
@@ -114,7 +116,7 @@ def map_regon_type_safely(type_code: str) -> 'EntityType':
     from .data_mapper import EntityType
     
     if not isinstance(type_code, str):
-        logger.warning(f"Type code is not string: {type(type_code)}")
+        logger.warning("Type code is not string: %s", type(type_code))
         return EntityType.LegalPerson
         
     type_code = type_code.strip().upper()
@@ -128,7 +130,7 @@ def map_regon_type_safely(type_code: str) -> 'EntityType':
     
     mapped_type = type_mapping.get(type_code)
     if mapped_type is None:
-        logger.warning(f"Unknown REGON entity type: '{type_code}', defaulting to LegalPerson")
+        logger.warning("Unknown REGON entity type: '%s', defaulting to LegalPerson", type_code)
         return EntityType.LegalPerson
         
     return mapped_type
@@ -174,7 +176,7 @@ def safe_extract_regon_report_data(response_xml: str, report_type: str) -> Dict[
                     }
                     
         except ET.ParseError as e:
-            logger.warning(f"Failed to parse report XML, storing as raw: {str(e)}")
+            logger.warning("Failed to parse report XML, storing as raw: %s", e)
             
         # Fallback to storing raw response
         return {
@@ -183,7 +185,7 @@ def safe_extract_regon_report_data(response_xml: str, report_type: str) -> Dict[
         }
         
     except Exception as e:
-        logger.error(f"Unexpected error extracting REGON report data: {str(e)}")
+        logger.error("Unexpected error extracting REGON report data: %s", e)
         return {
             "error": f"Report parsing error: {str(e)}",
             "report_type": report_type
@@ -198,11 +200,11 @@ def validate_regon_response_structure(response_text: str, expected_element: str)
             
         # Check for expected element presence
         if expected_element not in response_text:
-            logger.debug(f"Expected element '{expected_element}' not found in response")
+            logger.debug("Expected element '%s' not found in response", expected_element)
             return False
             
         return True
         
     except Exception as e:
-        logger.error(f"Error validating REGON response structure: {str(e)}")
+        logger.error("Error validating REGON response structure: %s", e)
         return False
\ No newline at end of file
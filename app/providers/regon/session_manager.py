@@ -49,7 +49,7 @@ class RegonSessionManager:
             self._parse_session_response(response_text)
 
         except Exception as e:
-            logger.error(f"Failed to create session: {str(e)}")
+            logger.error("Failed to create session: %s", e)
             raise
 
     def _build_login_soap_body(self) -> str:
@@ -83,7 +83,7 @@ class RegonSessionManager:
         if result_element is not None and result_element.text:
             self.session_id = result_element.text.strip()
             self.session_expires = datetime.now() + timedelta(minutes=30)
-            logger.info(f"Session created successfully: {self.session_id[:20]}...")
+            logger.info("Session created successfully: %s...", self.session_id[:20])
         else:
             raise RuntimeError("Empty session ID received from REGON API")
 
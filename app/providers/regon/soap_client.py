@@ -15,6 +15,23 @@ class RegonSoapClient:
     def __init__(self, api_url: str, timeout: int = 30):
         self.api_url = api_url
         self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(max_connections=100),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_soap_request(
         self,
@@ -31,25 +48,26 @@ class RegonSoapClient:
         if session_id:
             headers["sid"] = session_id
 
-        logger.debug(f"Sending SOAP request to {self.api_url}")
-        logger.debug(f"- Action: {action}")
-        logger.debug(f"- Headers: {headers}")
-        logger.debug(f"- Body: {soap_body[:200]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending SOAP request to %s", self.api_url)
+            logger.debug("- Action: %s", action)
+            logger.debug("- Headers: %s", headers)
+            logger.debug("- Body: %s...", soap_body[:200])
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(self.api_url, content=soap_body, headers=headers)
+        response = await self._get_client().post(self.api_url, content=soap_body, headers=headers)
 
-            logger.debug(f"Response status: {response.status_code}")
-            logger.debug(f"Response content: {response.text[:500]}...")
+        logger.debug("Response status: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response content: %s...", response.text[:500])
 
-            if response.status_code != 200:
-                raise httpx.HTTPStatusError(
-                    f"SOAP request failed with status {response.status_code}",
-                    request=response.request,
-                    response=response
-                )
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(
+                f"SOAP request failed with status {response.status_code}",
+                request=response.request,
+                response=response
+            )
 
-            return response.text
+        return response.text
 
     def extract_soap_envelope(self, response_text: str) -> str:
         """Extract the SOAP envelope from the response text."""
@@ -66,8 +84,8 @@ class RegonSoapClient:
             cleaned_xml = self.extract_soap_envelope(xml_text)
             return ET.fromstring(cleaned_xml)
         except ET.ParseError as e:
-            logger.error(f"Failed to parse XML response: {str(e)}")
-            logger.error(f"XML content: {xml_text[:1000]}...")
+            logger.error("Failed to parse XML response: %s", e)
+            logger.error("XML content: %s...", xml_text[:1000])
             raise
 
     def find_xml_element(
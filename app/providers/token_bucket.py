@@ -0,0 +1,52 @@
+"""In-process token bucket used by provider rate limiters."""
+
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket with a fixed capacity refilled at a constant rate."""
+
+    __slots__ = ("capacity", "rate", "tokens", "last")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.last = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Return seconds until a token is available (0.0 if one is available now)."""
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def try_take(self, now: Optional[float] = None) -> float:
+        """Take a token if available; return 0.0 on success or the seconds to wait otherwise."""
+        wait = self.wait_time(now)
+        if wait == 0.0:
+            self.tokens -= 1
+        return wait
+
+    def reserve(self, max_wait: float, now: Optional[float] = None) -> Optional[float]:
+        """Take a token ahead of time; return the seconds to wait before using it, or None if over max_wait.
+
+        Reservations may drive the bucket negative, so each later caller is
+        queued one refill interval behind the previous one.
+        """
+        wait = self.wait_time(now)
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def drain(self, seconds: float, now: Optional[float] = None) -> None:
+        """Push the next available token at least the given number of seconds into the future."""
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
@@ -1,3 +1,4 @@
+import asyncio
 import secrets
 import httpx
 from typing import Optional
@@ -92,28 +93,19 @@ class GitHubOAuthProvider(OAuthProvider):
 
     async def get_user_info(self, access_token: str) -> OAuthUserInfo:
         """Get GitHub user information"""
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
         async with httpx.AsyncClient() as client:
-            # Get user profile
-            response = await client.get(
-                self.user_api_url,
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-                timeout=10.0
+            # Get user profile and emails concurrently
+            response, email_response = await asyncio.gather(
+                client.get(self.user_api_url, headers=headers, timeout=10.0),
+                client.get(f"{self.user_api_url}/emails", headers=headers, timeout=10.0),
             )
             response.raise_for_status()
             user_data = response.json()
 
-            # Get user emails
-            email_response = await client.get(
-                f"{self.user_api_url}/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                },
-                timeout=10.0
-            )
             email_response.raise_for_status()
             emails = email_response.json()
 
@@ -252,17 +244,11 @@ class OAuthService:
         provider = self.get_provider(provider_name)
         return await provider.exchange_code_for_token(code)
 
-    async def get_user_info(self, provider_name: str, access_token: str) -> OAuthUserInfo:
+    async def fetch_user_info(self, provider_name: str, access_token: str) -> OAuthUserInfo:
         """Get user information from provider"""
         provider = self.get_provider(provider_name)
         return await provider.get_user_info(access_token)
 
-    async def complete_oauth_flow(self, provider_name: str, code: str) -> tuple[OAuthUserInfo, OAuthTokenResponse]:
-        """Complete OAuth flow: exchange code for token and get user info"""
-        token_response = await self.exchange_code_for_token(provider_name, code)
-        user_info = await self.get_user_info(provider_name, token_response.access_token)
-        return user_info, token_response
-
 
 # Global OAuth service instance
 oauth_service = OAuthService()
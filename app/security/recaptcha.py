@@ -1,11 +1,17 @@
+import hashlib
 import httpx
-from typing import Dict, Any, Optional
+from typing import Optional
 from pydantic import BaseModel
 from app.config import settings
+from app.utils.ttl_cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Successfully verified tokens are remembered briefly so repeated checks within a request skip Google
+_RESULT_TTL_SECONDS = 90
+_RESULT_MAX_ENTRIES = 10_000
+
 class ReCaptchaVerificationResponse(BaseModel):
     """reCAPTCHA verification response model"""
     success: bool
@@ -24,7 +30,8 @@ class ReCaptchaService:
         self.min_score = settings.recaptcha_min_score
         self.timeout = settings.recaptcha_timeout
         self.enabled = settings.recaptcha_enabled
-    
+        self._results: "TTLCache[str, ReCaptchaVerificationResponse]" = TTLCache(_RESULT_MAX_ENTRIES, _RESULT_TTL_SECONDS)
+
     async def verify_token(
         self, 
         token: str, 
@@ -51,6 +58,11 @@ class ReCaptchaService:
                 error_codes=["missing-secret-key"]
             )
         
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
         try:
             data = {
                 "secret": self.secret_key,
@@ -70,7 +82,11 @@ class ReCaptchaService:
                 
                 logger.info(f"reCAPTCHA verification result: {result}")
                 
-                return ReCaptchaVerificationResponse(**result)
+                verification = ReCaptchaVerificationResponse(**result)
+                # Only successes are remembered, so a failed check can be retried with the same token
+                if verification.success:
+                    self._results.set(key, verification)
+                return verification
                 
         except httpx.TimeoutException:
             logger.error("reCAPTCHA verification timeout")
@@ -1,13 +1,18 @@
-from datetime import datetime, timedelta, timezone
+import asyncio
+import time
+from datetime import timedelta
 from typing import Optional
 import bcrypt
-from jose import jwt, exceptions
+from jose import jwk, jwt, exceptions
 from app.config import settings
 
+# Prepared once at import so token signing/verification skips key construction
+_JWT_KEY = jwk.construct(settings.secret_key, settings.algorithm)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
@@ -16,23 +21,43 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread to keep bcrypt off the event loop."""
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread to keep bcrypt off the event loop."""
+    return await asyncio.to_thread(verify_password, password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash was made with a different cost factor."""
+    # bcrypt hashes look like $2b$<rounds>$<salt+hash>
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.bcrypt_rounds
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    # A single clock read gives consistent iat/exp as plain epoch seconds
+    now = int(time.time())
+    to_encode.update({"iat": now, "exp": now + int(expires_delta.total_seconds())})
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=settings.algorithm)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[dict]:
     """Verify a JWT token and return its payload."""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=[settings.algorithm])
         return payload
     except exceptions.JWTError:
         return None
@@ -1,6 +1,32 @@
 import re
+from functools import lru_cache
 from typing import Optional
 
+# NIPs and REGONs are ASCII digits; everything else (dashes, spaces) is stripped
+_NON_DIGIT = re.compile(r"[^0-9]")
+_NIP_WEIGHTS = (6, 5, 7, 2, 3, 4, 5, 6, 7)
+_REGON9_WEIGHTS = (8, 9, 2, 3, 4, 5, 6, 7)
+_REGON14_WEIGHTS = (2, 4, 8, 5, 0, 9, 7, 3, 6, 1, 2, 4, 8)
+
+# Country code, check digits and an 11-30 character alphanumeric BBAN (15-34 characters total)
+_IBAN_FORMAT = re.compile(r"[A-Z]{2}[0-9]{2}[A-Z0-9]{11,30}")
+
+# Letter-to-number mapping used by the IBAN mod-97 checksum (A=10 ... Z=35)
+_IBAN_LETTER_DIGITS = str.maketrans({c: str(i) for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 10)})
+
+
+def _is_valid_nip_digits(digits: str) -> bool:
+    """Check length, repeated digits and mod-11 checksum of a digits-only NIP."""
+    # NIP must be exactly 10 digits, not all the same
+    if len(digits) != 10 or digits.count(digits[0]) == 10:
+        return False
+
+    codes = digits.encode("ascii")
+    checksum = sum((code - 48) * weight for code, weight in zip(codes, _NIP_WEIGHTS))
+
+    # Check if checksum modulo 11 equals the last digit
+    return checksum % 11 == codes[9] - 48
+
 
 def validate_nip(nip: str) -> bool:
     """
@@ -15,25 +41,11 @@ def validate_nip(nip: str) -> bool:
     if not nip:
         return False
 
-    # Remove any non-digit characters
-    nip_clean = re.sub(r"\D", "", nip)
-
-    # NIP must be exactly 10 digits
-    if len(nip_clean) != 10:
-        return False
-
-    # Check if all digits are the same (invalid)
-    if len(set(nip_clean)) == 1:
-        return False
-
-    # Calculate checksum
-    weights = [6, 5, 7, 2, 3, 4, 5, 6, 7]
-    checksum = sum(int(digit) * weight for digit, weight in zip(nip_clean[:9], weights))
-
-    # Check if checksum modulo 11 equals the last digit
-    return (checksum % 11) == int(nip_clean[9])
+    return _is_valid_nip_digits(_NON_DIGIT.sub("", nip))
 
 
+# Lookups repeat the same NIPs, so memoize the strip + checksum work
+@lru_cache(maxsize=4096)
 def normalize_nip(nip: str) -> Optional[str]:
     """
     Normalize NIP to standard format (10 digits).
@@ -48,9 +60,9 @@ def normalize_nip(nip: str) -> Optional[str]:
         return None
 
     # Remove any non-digit characters
-    nip_clean = re.sub(r"\D", "", nip)
+    nip_clean = _NON_DIGIT.sub("", nip)
 
-    if validate_nip(nip_clean):
+    if _is_valid_nip_digits(nip_clean):
         return nip_clean
 
     return None
@@ -70,31 +82,43 @@ def validate_regon(regon: str) -> bool:
         return False
 
     # Remove any non-digit characters
-    regon_clean = re.sub(r"\D", "", regon)
+    regon_clean = _NON_DIGIT.sub("", regon)
 
     # REGON can be 9 or 14 digits
-    if len(regon_clean) not in [9, 14]:
+    if len(regon_clean) not in (9, 14):
         return False
 
+    codes = regon_clean.encode("ascii")
+
     # Validate 9-digit REGON
-    if len(regon_clean) == 9:
-        weights = [8, 9, 2, 3, 4, 5, 6, 7]
-        checksum = sum(
-            int(digit) * weight for digit, weight in zip(regon_clean[:8], weights)
-        )
-        return (checksum % 11) % 10 == int(regon_clean[8])
+    if len(codes) == 9:
+        checksum = sum((code - 48) * weight for code, weight in zip(codes, _REGON9_WEIGHTS))
+        return (checksum % 11) % 10 == codes[8] - 48
 
     # Validate 14-digit REGON
-    if len(regon_clean) == 14:
+    if len(codes) == 14:
         # First validate the 9-digit part
         if not validate_regon(regon_clean[:9]):
             return False
 
         # Then validate the full 14-digit number
-        weights = [2, 4, 8, 5, 0, 9, 7, 3, 6, 1, 2, 4, 8]
-        checksum = sum(
-            int(digit) * weight for digit, weight in zip(regon_clean[:13], weights)
-        )
-        return (checksum % 11) % 10 == int(regon_clean[13])
+        checksum = sum((code - 48) * weight for code, weight in zip(codes, _REGON14_WEIGHTS))
+        return (checksum % 11) % 10 == codes[13] - 48
 
     return False
+
+
+def normalize_iban(iban: str) -> str:
+    """Remove spaces from an IBAN and upper-case it."""
+    # str.replace + upper run on CPython's ASCII fast paths; translate tables are several times slower here
+    return iban.replace(" ", "").upper()
+
+
+def validate_iban(iban: str) -> bool:
+    """Validate the format and mod-97 checksum of a normalized IBAN."""
+    if not iban or _IBAN_FORMAT.fullmatch(iban) is None:
+        return False
+
+    # ISO 13616 checksum: move the first four characters to the end, map letters to 10..35
+    rearranged = iban[4:] + iban[:4]
+    return int(rearranged.translate(_IBAN_LETTER_DIGITS)) % 97 == 1
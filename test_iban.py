@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import sys
+from unittest.mock import patch
 
 # Add the app directory to Python path
 sys.path.insert(0, 'app')
@@ -102,6 +103,39 @@ async def test_invalid_iban():
     return result
 
 
+async def test_batch_deduplication():
+    """Test that duplicate and case/spacing variants in a batch share one upstream lookup."""
+    print("\n" + "="*60)
+    print("🔁 TESTING BATCH DEDUPLICATION")
+    print("="*60)
+
+    client = IbanEnrichmentClient(ibanapi_com_key=None, apilayer_api_key=None)
+
+    # Count upstream lookups instead of hitting the network
+    lookups = []
+
+    async def fake_lookup(clean_iban):
+        lookups.append(clean_iban)
+        await asyncio.sleep(0.01)
+        return client._create_empty_enrichment(clean_iban, "stubbed lookup")
+
+    # A bank code with no local entry, so the lookup is not answered from the bundled table
+    iban = "PL29999010140000071219812874"
+    spaced = " ".join(iban[i:i + 4] for i in range(0, len(iban), 4))
+    accounts = [iban, iban, spaced.lower(), f"  {iban}  "]
+    with patch.object(client, "_lookup", fake_lookup):
+        results = await client.batch_enrich_accounts(accounts)
+
+    print("\n📋 RESULT:")
+    print(f"Accounts: {len(accounts)}, result keys: {len(results)}, upstream lookups: {len(lookups)}")
+
+    assert lookups == [iban], f"expected one lookup for {iban}, got {lookups}"
+    assert set(results) == {iban, spaced.lower()}, f"unexpected result keys: {sorted(results)}"
+    print("✅ Duplicates and variants were looked up once")
+
+    return results
+
+
 async def compare_results():
     """Compare free vs paid results."""
     print("\n" + "="*60)
@@ -133,6 +167,9 @@ async def main():
         # Test invalid IBAN first
         await test_invalid_iban()
 
+        # Test batch deduplication (no network)
+        await test_batch_deduplication()
+
         # Test free scenario
         await test_free_scenario()
 